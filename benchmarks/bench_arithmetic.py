@@ -0,0 +1,70 @@
+import sys
+import random
+import argparse
+from time import perf_counter
+from typing import Optional
+
+from calc_arithmetic import arithmetics
+
+
+def typical_operands(count: int, rng: random.Random) -> list[tuple[str, str]]:
+    pairs = []
+    for _ in range(count):
+        left = str(rng.randint(-10 ** 6, 10 ** 6))
+        right = f'{rng.randint(1, 10 ** 4)}.{rng.randint(0, 99):02d}'
+        pairs.append((left, right) if rng.random() < 0.5 else (right, left))
+    return pairs
+
+
+def large_operands(count: int, rng: random.Random, digits: int) -> list[tuple[str, str]]:
+    pairs = []
+    for _ in range(count):
+        left = str(rng.randrange(10 ** (digits - 1), 10 ** digits))
+        right = str(rng.randrange(10 ** (digits - 1), 10 ** digits))
+        if rng.random() < 0.5:
+            right = right[:digits // 2] + '.' + right[digits // 2:]
+        pairs.append((left, right))
+    return pairs
+
+
+def throughput(arithmetic, pairs: list[tuple[str, str]], sign: str) -> Optional[float]:
+    operands = [(arithmetic.parse(left), arithmetic.parse(right)) for left, right in pairs]
+    func = arithmetic.operations[sign]
+    start = perf_counter()
+    try:
+        for left, right in operands:
+            func(left, right)
+    except OverflowError:
+        return None
+    return len(operands) / (perf_counter() - start)
+
+
+def format_rate(rate: Optional[float]) -> str:
+    return f'{rate:>14.0f}' if rate is not None else f'{"overflow":>14}'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Arithmetic backend throughput')
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--large-count', type=int, default=2000)
+    parser.add_argument('--digits', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workloads = {
+        'typical': typical_operands(args.count, rng),
+        f'{args.digits} digits': large_operands(args.large_count, rng, args.digits),
+    }
+
+    print(f'{"backend":<10}{"workload":<14}' + ''.join(f'{sign + " ops/s":>14}' for sign in '+-x/'))
+    for workload, pairs in workloads.items():
+        for name, arithmetic_class in arithmetics.items():
+            arithmetic = arithmetic_class()
+            rates = [throughput(arithmetic, pairs, sign) for sign in '+-x/']
+            print(f'{name:<10}{workload:<14}' + ''.join(format_rate(rate) for rate in rates))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
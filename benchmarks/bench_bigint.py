@@ -0,0 +1,58 @@
+import sys
+import random
+import argparse
+from time import perf_counter
+
+from calc_bigint import int_to_str, str_to_int, compact_int, max_str_digits
+from calc_format import NumberFormatter
+
+
+def timed(func, *args) -> tuple[object, float]:
+    start = perf_counter()
+    result = func(*args)
+    return result, (perf_counter() - start) * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Million-digit multiply and display')
+    parser.add_argument('--digits', type=int, default=1_000_000)
+    parser.add_argument('--builtin', action='store_true',
+                        help='also time int() and str() with the digit limit lifted, quadratic and slow')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [str(rng.randrange(1, 10)) + ''.join(rng.choices('0123456789', k=args.digits - 1)) for _ in range(2)]
+    formatter = NumberFormatter(16)
+
+    (left, right), parse_ms = timed(lambda: [str_to_int(text) for text in texts])
+    product, multiply_ms = timed(lambda: left * right)
+    display, display_ms = timed(formatter.format, product)
+    compact, compact_ms = timed(compact_int, product, 16)
+    full, full_ms = timed(int_to_str, product)
+
+    print(f'{args.digits:,}-digit operands, {len(full):,}-digit product')
+    print(f'{"parse both operands":<28}{parse_ms:10.1f} ms')
+    print(f'{"multiply":<28}{multiply_ms:10.1f} ms')
+    print(f'{"display " + display:<28}{display_ms:10.1f} ms')
+    print(f'{"compact_int":<28}{compact_ms:10.1f} ms')
+    print(f'{"full decimal string":<28}{full_ms:10.1f} ms')
+
+    if args.builtin:
+        limit = max_str_digits()
+        if hasattr(sys, 'set_int_max_str_digits'):
+            sys.set_int_max_str_digits(0)
+        try:
+            _, builtin_parse_ms = timed(lambda: [int(text) for text in texts])
+            builtin_full, builtin_full_ms = timed(str, product)
+        finally:
+            if hasattr(sys, 'set_int_max_str_digits'):
+                sys.set_int_max_str_digits(limit)
+        assert builtin_full == full
+        print(f'{"builtin int() both":<28}{builtin_parse_ms:10.1f} ms')
+        print(f'{"builtin str()":<28}{builtin_full_ms:10.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import sys
+import random
+import argparse
+from time import perf_counter
+from typing import Optional
+
+from calc_arithmetic import DecimalArithmetic
+from calc_cache import ResultCache
+
+
+def workload(arithmetic: DecimalArithmetic, distinct: int, count: int,
+             digits: int, rng: random.Random) -> list[tuple[str, object, object]]:
+    pool = []
+    for _ in range(distinct):
+        left = arithmetic.parse(str(rng.randrange(10 ** (digits - 1), 10 ** digits)))
+        right = arithmetic.parse(f'{rng.randrange(1, 10 ** 6)}.{rng.randrange(1, 1000)}')
+        pool.append((rng.choice('x/'), left, right))
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def run(arithmetic: DecimalArithmetic, calls: list, cache: Optional[ResultCache] = None) -> float:
+    operations = arithmetic.operations
+    start = perf_counter()
+    for sign, left, right in calls:
+        if cache is None:
+            operations[sign](left, right)
+        else:
+            cache.call(sign, operations[sign], left, right)
+    return (perf_counter() - start) / len(calls)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Result cache latency on repeated workloads')
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--distinct', type=int, default=200)
+    parser.add_argument('--digits', type=int, default=2000)
+    parser.add_argument('--precision', type=int, default=2000)
+    parser.add_argument('--max-entries', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    arithmetic = DecimalArithmetic(precision=args.precision)
+    calls = workload(arithmetic, args.distinct, args.count, args.digits, random.Random(args.seed))
+
+    uncached = run(arithmetic, calls)
+    cache = ResultCache(max_entries=args.max_entries)
+    cached = run(arithmetic, calls, cache)
+
+    print(f'uncached {uncached * 1e6:10.2f} us per call')
+    print(f'cached   {cached * 1e6:10.2f} us per call  ({uncached / cached:.1f}x)')
+    print(cache.stats())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import os
+import sys
+import argparse
+from statistics import mean, median
+from time import perf_counter_ns
+from typing import Callable
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# benchmark clicks stay out of the user's calculation history
+os.environ.setdefault('CALC_HISTORY', '')
+
+from PySide6.QtWidgets import QApplication
+
+from main import Calculator, error_disabled_buttons
+
+
+def legacy_disable_buttons(window: Calculator, disable: bool) -> None:
+    # the previous implementation: one setDisabled and one setStyleSheet per button
+    color = 'color: #888;' if disable else 'color: white;'
+    for btn_name in error_disabled_buttons:
+        btn = getattr(window.ui, btn_name)
+        btn.setDisabled(disable)
+        btn.setStyleSheet(color)
+
+
+def measure(app: QApplication, toggle: Callable[[bool], None], cycles: int) -> list[int]:
+    timings = []
+    for _ in range(cycles):
+        start = perf_counter_ns()
+        toggle(True)
+        app.processEvents()
+        toggle(False)
+        app.processEvents()
+        timings.append(perf_counter_ns() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Error state enter/exit benchmark')
+    parser.add_argument('--cycles', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    window = Calculator()
+    window.show()
+    app.processEvents()
+
+    scenarios = {
+        'disabled rule': window.disable_buttons,
+        'per-button stylesheet': lambda disable: legacy_disable_buttons(window, disable),
+    }
+    for name, toggle in scenarios.items():
+        timings = measure(app, toggle, args.cycles)
+        print(f'{name:<24} mean {mean(timings) / 1e3:8.1f} us   '
+              f'median {median(timings) / 1e3:8.1f} us per enter/exit cycle')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
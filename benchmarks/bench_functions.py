@@ -0,0 +1,81 @@
+import sys
+import math
+import random
+import argparse
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from calc_arithmetic import FloatArithmetic, power
+from calc_batch import evaluate_batch, evaluate_function_batch, operator_codes
+from calc_functions import functions
+
+
+# the straightforward math module call for each function, angles in degrees as in the calculator
+naive_functions: dict[str, Callable[[float], float]] = {
+    'sin': lambda value: math.sin(math.radians(value)),
+    'cos': lambda value: math.cos(math.radians(value)),
+    'tan': lambda value: math.tan(math.radians(value)),
+    'sqrt': math.sqrt,
+    'sqr': lambda value: value ** 2,
+    'reciprocal': lambda value: 1 / value,
+    'ln': math.log,
+    'log': math.log10,
+    'exp': math.exp,
+    'exp10': lambda value: math.pow(10, value),
+}
+
+
+def throughput(func: Callable[[], object], count: int, repeat: int) -> float:
+    best = min(timed(func) for _ in range(repeat))
+    return count / best / 1e6
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = perf_counter()
+    func()
+    return perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Scientific function throughput: math loop, scalar, vectorized')
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    values = [rng.uniform(0.001, 100.0) for _ in range(args.count)]
+    array = np.array(values)
+    arithmetic = FloatArithmetic()
+
+    print(f'{args.count:,} values, millions per second')
+    print(f'{"function":<12}{"math loop":>12}{"scalar":>12}{"vectorized":>12}')
+    for name, naive in naive_functions.items():
+        func = functions[name]
+        rows = (
+            throughput(lambda: [naive(value) for value in values], args.count, args.repeat),
+            throughput(lambda: [func(arithmetic, value) for value in values], args.count, args.repeat),
+            throughput(lambda: evaluate_function_batch(name, array), args.count, args.repeat),
+        )
+        print(f'{name:<12}' + ''.join(f'{row:12.2f}' for row in rows))
+
+    bases = [rng.uniform(0.5, 2.0) for _ in range(args.count)]
+    exponents = [rng.randrange(-20, 21) for _ in range(args.count)]
+    base_array, exponent_array = np.array(bases), np.array(exponents, dtype=np.float64)
+    codes = np.full(args.count, operator_codes['^'], dtype=np.uint8)
+    rows = (
+        throughput(lambda: [math.pow(base, exponent) for base, exponent in zip(bases, exponents)],
+                   args.count, args.repeat),
+        throughput(lambda: [power(base, exponent) for base, exponent in zip(bases, exponents)],
+                   args.count, args.repeat),
+        throughput(lambda: evaluate_batch(base_array, exponent_array, codes), args.count, args.repeat),
+    )
+    print(f'{"x^n":<12}' + ''.join(f'{row:12.2f}' for row in rows))
+    print(f'{"np.power":<12}{"":>24}{throughput(lambda: np.power(base_array, exponent_array), args.count, args.repeat):12.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+import sys
+import argparse
+from statistics import median
+from time import perf_counter
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication
+
+from calc_plot import PlotExpression
+from calc_plot_view import PlotCanvas
+
+
+frame_budget_ms = 16.0
+
+
+def repaint_ms(canvas: PlotCanvas) -> float:
+    start = perf_counter()
+    canvas.repaint()
+    return (perf_counter() - start) * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Plot sampling and redraw time against a frame budget')
+    parser.add_argument('expression', nargs='?', default='sin(t x 1000000) x t')
+    parser.add_argument('--width', type=int, default=1024)
+    parser.add_argument('--height', type=int, default=600)
+    parser.add_argument('--units-per-pixel', type=float, default=1 / 64)
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    canvas = PlotCanvas()
+    canvas.resize(args.width, args.height)
+    canvas.units_per_pixel = args.units_per_pixel
+    canvas.show()
+    app.processEvents()
+
+    canvas.set_expression(PlotExpression(args.expression))
+    first_ms = repaint_ms(canvas)
+    print(f'{args.expression!r}: {canvas.cache.samples:,} samples in {len(canvas.cache.paths)} tiles')
+    print(f'{"first frame, sampling":<28}{first_ms:10.1f} ms')
+
+    redraws = [repaint_ms(canvas) for _ in range(args.frames)]
+    print(f'{"redraw, median":<28}{median(redraws):10.2f} ms  max {max(redraws):.2f}')
+
+    # one pixel per frame, tiles come from the cache until the view reaches a new one
+    pans = []
+    for _ in range(args.frames):
+        canvas.center_x += canvas.units_per_pixel
+        pans.append(repaint_ms(canvas))
+    print(f'{"pan, median":<28}{median(pans):10.2f} ms  max {max(pans):.2f}')
+
+    # zooming inside a power of two keeps the zoom level and its tiles
+    zooms = []
+    for _ in range(args.frames):
+        canvas.units_per_pixel *= 1.005
+        zooms.append(repaint_ms(canvas))
+    print(f'{"zoom, median":<28}{median(zooms):10.2f} ms  max {max(zooms):.2f}')
+
+    slow = sum(ms > frame_budget_ms for ms in redraws + pans + zooms)
+    print(f'{slow} of {3 * args.frames} frames over {frame_budget_ms:.0f} ms, '
+          f'{canvas.cache.misses} tiles sampled, {canvas.cache.samples:,} samples')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import sys
+import random
+import argparse
+from time import perf_counter
+
+from calc_bigint import max_str_digits
+from calc_radix import RadixViews, radix_names, to_base
+
+
+frame_budget_ms = 16.0
+
+
+def timed(func, *args) -> tuple[object, float]:
+    start = perf_counter()
+    result = func(*args)
+    return result, (perf_counter() - start) * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Radix views of a large int against a frame budget')
+    parser.add_argument('--bits', type=int, default=100_000)
+    parser.add_argument('--builtin', action='store_true',
+                        help='also time str() with the digit limit lifted, quadratic and slow')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    value = random.Random(args.seed).getrandbits(args.bits) | 1 << (args.bits - 1)
+    print(f'{args.bits:,}-bit value, frame budget {frame_budget_ms:.0f} ms')
+
+    # the first decimal conversion also fills the power-of-two cache
+    _, cold_ms = timed(to_base, value, 10)
+    print(f'{"DEC cold":<20}{cold_ms:10.2f} ms')
+    for base, name in radix_names.items():
+        text, ms = timed(to_base, value + 1, base)
+        print(f'{name:<20}{ms:10.2f} ms  {len(text):,} digits')
+
+    views = RadixViews()
+    views.set_value(value + 2)
+    _, all_ms = timed(lambda: [views.view(base) for base in radix_names])
+    _, cached_ms = timed(lambda: [views.view(base) for base in radix_names])
+    print(f'{"all views":<20}{all_ms:10.2f} ms  {"within" if all_ms <= frame_budget_ms else "over"} budget')
+    print(f'{"all views cached":<20}{cached_ms:10.2f} ms')
+
+    if args.builtin:
+        limit = max_str_digits()
+        if hasattr(sys, 'set_int_max_str_digits'):
+            sys.set_int_max_str_digits(0)
+        try:
+            builtin, builtin_ms = timed(str, value + 1)
+        finally:
+            if hasattr(sys, 'set_int_max_str_digits'):
+                sys.set_int_max_str_digits(limit)
+        assert builtin == to_base(value + 1, 10)
+        print(f'{"builtin str()":<20}{builtin_ms:10.2f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from time import sleep, perf_counter, perf_counter_ns
+
+from calc_profile import LatencyHistogram
+
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def workload(count: int, rng: random.Random) -> list[bytes]:
+    lines = []
+    for request_id in range(count):
+        left = rng.choice((str(rng.randrange(-10 ** 6, 10 ** 6)), f'{rng.uniform(-1e6, 1e6):.6f}'))
+        right = rng.choice((str(rng.randrange(0, 1000)), f'{rng.uniform(-1e3, 1e3):.3f}'))
+        request = {'id': request_id, 'left': left, 'operator': rng.choice('+-x/'), 'right': right}
+        lines.append(json.dumps(request).encode() + b'\n')
+    return lines
+
+
+async def client(path: str, lines: list[bytes], window: int, histogram: LatencyHistogram) -> None:
+    # keeps up to window requests outstanding, the server answers each connection in order
+    reader, writer = await asyncio.open_unix_connection(path)
+    outstanding = asyncio.Semaphore(window)
+    sent: list[int] = []
+    received = 0
+
+    async def receive() -> None:
+        nonlocal received
+        while received < len(lines):
+            if not await reader.readline():
+                raise ConnectionError('server closed the connection')
+            histogram.record(perf_counter_ns() - sent[received])
+            received += 1
+            outstanding.release()
+
+    receiver = asyncio.create_task(receive())
+    for line in lines:
+        await outstanding.acquire()
+        sent.append(perf_counter_ns())
+        writer.write(line)
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+async def run_load(path: str, connections: int, lines: list[bytes], window: int) -> tuple[float, LatencyHistogram]:
+    histogram = LatencyHistogram()
+    per_client = len(lines) // connections
+    start = perf_counter()
+    await asyncio.gather(*(client(path, lines[i * per_client:(i + 1) * per_client], window, histogram)
+                           for i in range(connections)))
+    return perf_counter() - start, histogram
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Load generator for calc_server')
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--window', type=int, default=128)
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    lines = workload(args.requests, random.Random(args.seed))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'calc.sock')
+        server = subprocess.Popen([sys.executable, 'calc_server.py', '--unix', path, '--quiet',
+                                   '--max-batch', str(args.max_batch)], cwd=root)
+        try:
+            while not os.path.exists(path):
+                if server.poll() is not None:
+                    return 1
+                sleep(0.05)
+            elapsed, histogram = asyncio.run(run_load(path, args.connections, lines, args.window))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f'{histogram.count} requests over {args.connections} connections, window {args.window}')
+    print(f'{histogram.count / elapsed:,.0f} requests/s')
+    for name in ('p50', 'p90', 'p99'):
+        print(f'{name:<6}{histogram.percentile(int(name[1:]) / 100) / 1e3:10.1f} us')
+    print(f'{"p99.9":<6}{histogram.percentile(0.999) / 1e3:10.1f} us')
+    print(f'{"max":<6}{histogram.max / 1e3:10.1f} us')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+from typing import Optional
+from time import perf_counter, sleep
+
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+first_frame_script = '''
+from time import perf_counter_ns
+start = perf_counter_ns()
+import sys
+from PySide6.QtWidgets import QApplication
+from main import Calculator
+app = QApplication(sys.argv[:1])
+window = Calculator()
+window.show()
+app.processEvents()
+print(perf_counter_ns() - start)
+'''
+
+icon_scripts = {
+    'embedded calc_icons': '''
+from time import perf_counter_ns
+import PySide6.QtCore
+start = perf_counter_ns()
+import calc_icons
+print(perf_counter_ns() - start)
+''',
+    'mapped calc_icons.rcc': '''
+from time import perf_counter_ns
+import PySide6.QtCore
+start = perf_counter_ns()
+from calc_resources import load_icons
+load_icons()
+print(perf_counter_ns() - start)
+''',
+}
+
+
+def python_env(**overrides: str) -> dict:
+    return dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'),
+                CALC_HISTORY=os.environ.get('CALC_HISTORY', ''), **overrides)
+
+
+def run_python(args: list[str], env: Optional[dict] = None) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=root, env=env or python_env(),
+                          capture_output=True, text=True, check=True)
+
+
+def wall_ms(args: list[str], env: dict, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        run_python(args, env)
+        times.append((perf_counter() - start) * 1e3)
+    return median(times)
+
+
+def handoff_ms(repeat: int) -> float:
+    # a later launch against a calculator already running in the background, in a socket directory of its own
+    with tempfile.TemporaryDirectory() as runtime_dir:
+        env = python_env(XDG_RUNTIME_DIR=runtime_dir)
+        running = subprocess.Popen([sys.executable, 'main.py', '--background'], cwd=root, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while not os.listdir(runtime_dir):
+                if running.poll() is not None:
+                    raise RuntimeError('the background calculator exited')
+                sleep(0.05)
+            return wall_ms(['main.py'], env, repeat)
+        finally:
+            running.terminate()
+            running.wait()
+
+
+def timed_script(script: str, repeat: int) -> float:
+    return median(int(run_python(['-c', script]).stdout.split()[-1]) for _ in range(repeat)) / 1e6
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    # rows of (self us, cumulative us, module) from python -X importtime
+    rows = []
+    for line in run_python(['-X', 'importtime', '-c', f'import {module}']).stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(own), int(cumulative), name.rstrip()))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Startup time breakdown')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = import_times('main')
+    print(f'import main: {rows[-1][1] / 1e3:.1f} ms cumulative, top {args.top} by self time')
+    for own, cumulative, name in sorted(rows, reverse=True)[:args.top]:
+        print(f'{own / 1e3:8.1f} ms {cumulative / 1e3:8.1f} ms {name}')
+
+    print()
+    for name, script in icon_scripts.items():
+        print(f'{name:<24}{timed_script(script, args.repeat):8.2f} ms')
+    print(f'{"time to first frame":<24}{timed_script(first_frame_script, args.repeat):8.2f} ms')
+    print(f'{"bare interpreter":<24}{wall_ms(["-c", "pass"], python_env(), args.repeat):8.2f} ms')
+    print(f'{"second launch, handoff":<24}{handoff_ms(args.repeat):8.2f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+import sys
+import csv
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from calc_ingest import ingest
+from calc_stats import Statistics
+
+
+def measured(func, *args) -> tuple[float, float]:
+    # seconds untraced, then peak traced MB in a second run, tracing slows the Python loops a lot
+    start = perf_counter()
+    func(*args)
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def python_lists(path: str) -> tuple[float, float]:
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        next(reader)
+        values = [float(row[1]) for row in reader]
+    return statistics.fmean(values), statistics.variance(values)
+
+
+def welford(path: str) -> Statistics:
+    result = Statistics()
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row in reader:
+            result = result.added(float(row[1]))
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Column statistics: Python lists, streaming Welford, chunked NumPy')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    values = np.random.default_rng(args.seed).normal(1e9, 1e3, args.rows)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'values.csv')
+        bin_path = os.path.join(directory, 'values.f64')
+        with open(csv_path, 'w') as file:
+            file.write('id,value\n')
+            np.savetxt(file, np.column_stack([np.arange(args.rows), values]), delimiter=',', fmt=['%d', '%.17g'])
+        values.astype('<f8').tofile(bin_path)
+        print(f'{args.rows:,} rows, csv {os.path.getsize(csv_path) / 1024 / 1024:.0f} MB')
+
+        runs = (
+            ('python lists', python_lists, csv_path),
+            ('welford loop', welford, csv_path),
+            ('chunked csv', lambda path: ingest(path, 1), csv_path),
+            ('mapped float64', ingest, bin_path),
+        )
+        print(f'{"":<16}{"seconds":>10}{"peak MB":>10}')
+        for name, func, path in runs:
+            elapsed, peak = measured(func, path)
+            print(f'{name:<16}{elapsed:10.2f}{peak:10.1f}')
+
+    print(f'numpy mean {values.mean()!r} variance {values.var(ddof=1)!r}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from statistics import median
+from time import perf_counter_ns
+from typing import Callable
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# benchmark clicks stay out of the user's calculation history
+os.environ.setdefault('CALC_HISTORY', '')
+
+from PySide6.QtWidgets import QApplication, QMainWindow
+
+from calc_design import Ui_MainWindow
+from main import Calculator
+
+
+baseline_path = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+startup_script = '''
+from time import perf_counter_ns
+start = perf_counter_ns()
+import sys
+from PySide6.QtWidgets import QApplication
+from main import Calculator
+app = QApplication(sys.argv[:1])
+window = Calculator()
+window.show()
+print(perf_counter_ns() - start)
+'''
+
+
+def cold_startup(repeat: int) -> list[int]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', startup_script], cwd=root,
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(int(output.split()[-1]))
+    return timings
+
+
+def setup_ui(repeat: int) -> list[int]:
+    timings = []
+    for _ in range(repeat):
+        window = QMainWindow()
+        start = perf_counter_ns()
+        Ui_MainWindow().setupUi(window)
+        timings.append(perf_counter_ns() - start)
+        window.deleteLater()
+    return timings
+
+
+def press_keys(window: Calculator, btn_names: list[str], repeat: int,
+               reset: Callable[[], None]) -> list[int]:
+    buttons = [getattr(window.ui, btn_name) for btn_name in btn_names]
+    timings = []
+    for _ in range(repeat):
+        reset()
+        for btn in buttons:
+            start = perf_counter_ns()
+            btn.click()
+            timings.append(perf_counter_ns() - start)
+    return timings
+
+
+def run_scenarios(repeat: int, startup_repeat: int) -> dict[str, float]:
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = Calculator()
+    window.show()
+    app.processEvents()
+
+    def reset() -> None:
+        window.engine.clear_all()
+        window.render()
+
+    digits = [f'btn_{i % 10}' for i in range(1, 17)]
+    chain = ['btn_1'] + ['btn_add', 'btn_2'] * 8 + ['btn_equal']
+    error_cycle = ['btn_1', 'btn_div', 'btn_0', 'btn_equal', 'btn_ce']
+
+    scenarios = {
+        'cold_startup_ms': (lambda: cold_startup(startup_repeat), 1e6),
+        'setup_ui_ms': (lambda: setup_ui(repeat // 10 or 1), 1e6),
+        'long_digits_key_us': (lambda: press_keys(window, digits, repeat, reset), 1e3),
+        'operator_chain_key_us': (lambda: press_keys(window, chain, repeat, reset), 1e3),
+        'error_cycle_key_us': (lambda: press_keys(window, error_cycle, repeat, reset), 1e3),
+    }
+
+    results = {}
+    for name, (scenario, scale) in scenarios.items():
+        results[name] = median(scenario()) / scale
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base and value > base * (1 + threshold / 100):
+            regressions.append(f'{name}: {value:.2f} vs baseline {base:.2f} '
+                               f'(+{(value / base - 1) * 100:.0f}%)')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Offscreen GUI benchmark suite')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--startup-repeat', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help='allowed slowdown against the baseline, in percent')
+    parser.add_argument('--baseline', default=baseline_path)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = run_scenarios(args.repeat, args.startup_repeat)
+    for name, value in results.items():
+        print(f'{name:<24}{value:>10.2f}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f'baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'no baseline at {args.baseline}, run with --save-baseline first')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        regressions = compare(results, json.load(file), args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,305 @@
+import math
+from decimal import Decimal, Context, ROUND_HALF_EVEN
+from fractions import Fraction
+from operator import add, sub, mul, truediv, and_, or_, xor, lshift, rshift
+from typing import Callable, Union
+
+from calc_bigint import str_to_int
+
+
+Number = Union[int, float, Decimal, Fraction]
+
+# whole exponents that are cheaper as plain multiplications than as a pow call
+small_powers: dict[int, Callable[[Number], Number]] = {
+    0: lambda base: base ** 0,
+    1: lambda base: base,
+    2: lambda base: base * base,
+    3: lambda base: base * base * base,
+}
+
+
+def power(base: Number, exponent: Number) -> Number:
+    if type(exponent) is int:
+        fast = small_powers.get(exponent)
+        if fast is not None:
+            return fast(base)
+        if exponent < 0:
+            return truediv(1, power(base, -exponent))
+        if type(base) is float:
+            return math.pow(base, exponent)
+        # int ** int squares repeatedly and stays exact
+        return base ** exponent
+    return math.pow(base, exponent)
+
+
+def integer_root(value: int, degree: int) -> int:
+    # floor of the degree-th root of a non-negative int, Newton's method from above
+    if value < 2:
+        return value
+    if degree == 2:
+        return math.isqrt(value)
+    guess = 1 << -(-value.bit_length() // degree)
+    while True:
+        better = ((degree - 1) * guess + value // guess ** (degree - 1)) // degree
+        if better >= guess:
+            return guess
+        guess = better
+
+
+def root(value: Number, degree: Number) -> Number:
+    if degree == 0:
+        raise ValueError('zeroth root')
+    if degree < 0:
+        return truediv(1, root(value, -degree))
+
+    odd = type(degree) is int and degree % 2 == 1
+    if value < 0:
+        if not odd:
+            raise ValueError('even root of a negative number')
+        return -root(-value, degree)
+
+    if type(value) is int and type(degree) is int:
+        guess = integer_root(value, degree)
+        if guess ** degree == value:
+            return guess
+        if guess.bit_length() > 64:
+            # the fraction dropped by the floor is below float precision
+            return float(guess)
+        if value.bit_length() > 1023:
+            # math.log takes ints of any size where float(value) would overflow
+            return math.exp(math.log(value) / degree)
+    return math.pow(value, 1 / degree)
+
+
+# a shift past this many bits is refused rather than filling memory
+max_shift_bits = 1 << 24
+
+
+def as_integer(value: Number) -> int:
+    # whole floats, Decimals and Fractions count as integers, 6 / 2 is 3.0
+    if type(value) is int:
+        return value
+    try:
+        whole = int(value)
+    except (OverflowError, ValueError):
+        whole = None
+    if whole is None or whole != value:
+        raise ValueError('bitwise operations need integers')
+    return whole
+
+
+def bitwise(func: Callable[[int, int], int]) -> Callable[[Number, Number], Number]:
+    def operation(left: Number, right: Number) -> Number:
+        return func(as_integer(left), as_integer(right))
+    return operation
+
+
+def shift_left(value: int, bits: int) -> int:
+    if bits > max_shift_bits:
+        raise OverflowError('shift too large')
+    return lshift(value, bits)
+
+
+bitwise_operations = {
+    'and': bitwise(and_),
+    'or': bitwise(or_),
+    'xor': bitwise(xor),
+    '<<': bitwise(shift_left),
+    '>>': bitwise(rshift),
+}
+
+operations = {
+    '+': add,
+    '-': sub,
+    'x': mul,
+    '/': truediv,
+    '^': power,
+    'root': root,
+    **bitwise_operations,
+}
+
+
+def operand_size(value: Number) -> int:
+    # rough size in bits, only used to estimate how expensive an operation is
+    if type(value) is int:
+        return value.bit_length()
+    if isinstance(value, Fraction):
+        return value.numerator.bit_length() + value.denominator.bit_length()
+    if isinstance(value, Decimal):
+        return len(value.as_tuple().digits) * 10 // 3
+    return 64
+
+
+class FloatArithmetic:
+    name = 'float'
+
+    def __init__(self):
+        self.operations: dict[str, Callable[[Number, Number], Number]] = operations
+
+    def __reduce__(self):
+        # operations holds bound methods and closures, so rebuild instead of pickling them
+        return type(self), ()
+
+    def cost(self, sign: str, left: Number, right: Number) -> int:
+        if type(left) is float or type(right) is float:
+            return 1
+        left_size, right_size = operand_size(left), operand_size(right)
+        if sign in ('+', '-'):
+            return left_size + right_size
+        if sign == '^':
+            # the last squaring dominates, it works on half of the result
+            if type(right) is not int:
+                return 1
+            return (left_size * abs(right) // 2) ** 2
+        if sign == 'root':
+            return left_size * left_size
+        if sign in bitwise_operations:
+            return left_size + right_size
+        return left_size * right_size
+
+    def parse(self, text: str) -> Number:
+        text = text.rstrip('.')
+        try:
+            return str_to_int(text)
+        except ValueError:
+            return self.parse_real(text)
+
+    def parse_real(self, text: str) -> Number:
+        return float(text)
+
+    def coerce(self, value: Number) -> Number:
+        # the backend's own type for a value computed as a float, such as a sine
+        return value
+
+
+class DecimalArithmetic(FloatArithmetic):
+    name = 'decimal'
+
+    def __init__(self, precision: int = 28, rounding: str = ROUND_HALF_EVEN):
+        super(DecimalArithmetic, self).__init__()
+        self.precision = precision
+        self.rounding = rounding
+        self.context = Context(prec=precision, rounding=rounding)
+        self.operations = {
+            '+': self.add,
+            '-': self.sub,
+            'x': self.mul,
+            '/': self.divide,
+            '^': self.power,
+            'root': self.root,
+            **bitwise_operations,
+        }
+
+    def __reduce__(self):
+        return type(self), (self.precision, self.rounding)
+
+    def parse_real(self, text: str) -> Number:
+        return Decimal(text)
+
+    def coerce(self, value: Number) -> Number:
+        # the context refuses floats, the shortest repr keeps 0.1 from becoming 0.1000000000000000055511151231
+        if type(value) is float:
+            return self.context.create_decimal(repr(value))
+        return value
+
+    def cost(self, sign: str, left: Number, right: Number) -> int:
+        cost = super(DecimalArithmetic, self).cost(sign, left, right)
+        if sign == '/':
+            # a non-exact quotient is computed to the full context precision
+            cost = max(cost, self.precision * 10 // 3 * max(operand_size(left), operand_size(right)))
+        return cost
+
+    # int operands stay exact ints, only non-int results go through the context
+    def add(self, left: Number, right: Number) -> Number:
+        if type(left) is int and type(right) is int:
+            return left + right
+        return self.context.add(self.coerce(left), self.coerce(right))
+
+    def sub(self, left: Number, right: Number) -> Number:
+        if type(left) is int and type(right) is int:
+            return left - right
+        return self.context.subtract(self.coerce(left), self.coerce(right))
+
+    def mul(self, left: Number, right: Number) -> Number:
+        if type(left) is int and type(right) is int:
+            return left * right
+        return self.context.multiply(self.coerce(left), self.coerce(right))
+
+    def divide(self, left: Number, right: Number) -> Number:
+        if not right:
+            # the context reports 0/0 as InvalidOperation, keep ZeroDivisionError like float
+            raise ZeroDivisionError('division by zero')
+        if type(left) is int and type(right) is int:
+            quotient, remainder = divmod(left, right)
+            if not remainder:
+                return quotient
+        return self.context.divide(Decimal(self.coerce(left)), Decimal(self.coerce(right)))
+
+    def power(self, base: Number, exponent: Number) -> Number:
+        if type(base) is int and type(exponent) is int and exponent >= 0:
+            return power(base, exponent)
+        if type(exponent) is int and exponent < 0:
+            return self.divide(1, self.power(base, -exponent))
+        return self.context.power(Decimal(self.coerce(base)), Decimal(self.coerce(exponent)))
+
+    def root(self, value: Number, degree: Number) -> Number:
+        if type(value) is int and type(degree) is int and degree > 0 and value >= 0:
+            guess = integer_root(value, degree)
+            if guess ** degree == value:
+                return guess
+        if degree == 0 or (value < 0 and not (type(degree) is int and degree % 2 == 1)):
+            return root(value, degree)
+        if value < 0:
+            return -self.root(-value, degree)
+        return self.context.power(Decimal(self.coerce(value)), self.context.divide(1, Decimal(self.coerce(degree))))
+
+
+class FractionArithmetic(FloatArithmetic):
+    name = 'fraction'
+
+    def __init__(self):
+        super(FractionArithmetic, self).__init__()
+        self.operations = {
+            '+': self.exact(add),
+            '-': self.exact(sub),
+            'x': self.exact(mul),
+            '/': self.divide,
+            '^': self.power,
+            'root': root,
+            **bitwise_operations,
+        }
+
+    def parse_real(self, text: str) -> Number:
+        return Fraction(text)
+
+    @staticmethod
+    def exact(func: Callable[[Number, Number], Number]) -> Callable[[Number, Number], Number]:
+        def operation(left: Number, right: Number) -> Number:
+            result = func(left, right)
+            if type(result) is Fraction and result.denominator == 1:
+                return result.numerator
+            return result
+        return operation
+
+    @staticmethod
+    def divide(left: Number, right: Number) -> Number:
+        if type(left) is int and type(right) is int and right:
+            quotient, remainder = divmod(left, right)
+            if not remainder:
+                return quotient
+        result = Fraction(left) / Fraction(right)
+        return result.numerator if result.denominator == 1 else result
+
+    @staticmethod
+    def power(base: Number, exponent: Number) -> Number:
+        if type(exponent) is not int or type(base) is float:
+            return power(base, exponent)
+        result = Fraction(base) ** exponent
+        return result.numerator if result.denominator == 1 else result
+
+
+arithmetics = {
+    'float': FloatArithmetic,
+    'decimal': DecimalArithmetic,
+    'fraction': FractionArithmetic,
+}
@@ -0,0 +1,203 @@
+from operator import truediv
+from typing import Callable, Iterable
+
+import numpy as np
+
+from calc_engine import operations, error_zero_div, error_undefined, error_domain
+from calc_functions import exact_sines, exact_tangents, undefined_tangents
+
+
+status_ok = 0
+status_zero_div = 1
+status_undefined = 2
+status_invalid_operator = 3
+status_domain = 4
+
+status_messages = {
+    status_zero_div: error_zero_div,
+    status_undefined: error_undefined,
+    status_domain: error_domain,
+}
+
+# result values and their status codes
+Outcome = tuple[np.ndarray, np.ndarray]
+
+operator_codes = {sign: code for code, sign in enumerate(operations)}
+
+
+def encode_operators(signs: Iterable[str]) -> np.ndarray:
+    signs = np.asarray(signs if isinstance(signs, np.ndarray) else list(signs))
+    codes = np.full(signs.shape, len(operator_codes), dtype=np.uint8)
+    for sign, code in operator_codes.items():
+        codes[signs == sign] = code
+    return codes
+
+
+def evaluate_batch(left, right, codes) -> tuple[np.ndarray, np.ndarray]:
+    left = np.asarray(left)
+    right = np.asarray(right)
+    codes = np.asarray(codes)
+    left, right, codes = np.broadcast_arrays(left, right, codes)
+
+    result = np.full(codes.shape, np.nan, dtype=np.result_type(left, right, np.float64))
+    status = np.full(codes.shape, status_invalid_operator, dtype=np.uint8)
+
+    for sign, code in operator_codes.items():
+        mask = codes == code
+        if not mask.any():
+            continue
+        if mask.all():
+            # a batch of one operator skips the fancy-indexing copies
+            mask = slice(None)
+
+        # int64 operands would wrap around silently, the float result type shows the overflow
+        func = operations[sign]
+        lhs = left[mask].astype(result.dtype, copy=False)
+        rhs = right[mask].astype(result.dtype, copy=False)
+        if sign in vector_operations:
+            result[mask], status[mask] = vector_operations[sign](lhs, rhs)
+        elif func is truediv:
+            zero = rhs == 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = func(lhs, rhs)
+            values[zero] = np.nan
+            result[mask] = values
+            status[mask] = np.where(
+                zero, np.where(lhs == 0, status_undefined, status_zero_div), status_ok)
+        else:
+            result[mask] = func(lhs, rhs)
+            status[mask] = status_ok
+
+    return result, status
+
+
+def outcome(values: np.ndarray, valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # non-finite results from finite input are errors, as the scalar math functions raise for them
+    valid = valid & np.isfinite(values)
+    return np.where(valid, values, np.nan), np.where(valid, status_ok, status_domain).astype(np.uint8)
+
+
+def vector_power(base: np.ndarray, exponent: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # np.power beats repeated squaring on arrays, the element loop is already vectorized
+    with np.errstate(all='ignore'):
+        values = np.power(base, exponent)
+    zero_div = (base == 0) & (exponent < 0)
+    values, status = outcome(values, ~zero_div)
+    status[zero_div] = status_zero_div
+    return values, status
+
+
+def vector_root(value: np.ndarray, degree: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    odd = (degree == np.round(degree)) & (np.abs(degree) % 2 == 1)
+    with np.errstate(all='ignore'):
+        values = np.copysign(np.power(np.abs(value), 1 / degree), value)
+    zero_div = (value == 0) & (degree < 0)
+    values, status = outcome(values, ~zero_div & (degree != 0) & ((value >= 0) | odd))
+    status[zero_div] = status_zero_div
+    return values, status
+
+
+def reduce_degrees(values: np.ndarray) -> np.ndarray:
+    return np.mod(values, 360.0)
+
+
+def vector_sine(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    angles = reduce_degrees(values)
+    result = np.sin(np.radians(angles))
+    for angle, exact in exact_sines.items():
+        result[angles == angle] = exact
+    return outcome(result, np.isfinite(values))
+
+
+def vector_cosine(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return vector_sine(reduce_degrees(values) + 90.0)
+
+
+def vector_tangent(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    angles = reduce_degrees(values)
+    result = np.tan(np.radians(angles))
+    for angle, exact in exact_tangents.items():
+        result[angles == angle] = exact
+    return outcome(result, np.isfinite(values) & ~np.isin(angles, undefined_tangents))
+
+
+def vector_reciprocal(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(divide='ignore'):
+        result, status = outcome(1 / values, values != 0)
+    status[values == 0] = status_zero_div
+    return result, status
+
+
+def guarded(func: Callable[[np.ndarray], np.ndarray],
+            domain: Callable[[np.ndarray], np.ndarray]) -> Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]]:
+    def evaluate(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        valid = domain(values)
+        with np.errstate(all='ignore'):
+            return outcome(func(values), valid)
+    return evaluate
+
+
+def integral(values: np.ndarray) -> np.ndarray:
+    # whole numbers that fit the int64 lanes the bitwise kernels run on
+    with np.errstate(invalid='ignore'):
+        return np.isfinite(values) & (values == np.trunc(values)) & (np.abs(values) < 2.0 ** 63)
+
+
+def vector_bitwise(func: Callable[[np.ndarray, np.ndarray, np.ndarray], Outcome]) -> Callable[[np.ndarray, np.ndarray], Outcome]:
+    def evaluate(left: np.ndarray, right: np.ndarray) -> Outcome:
+        valid = integral(left) & integral(right)
+        lhs = np.where(valid, left, 0).astype(np.int64)
+        rhs = np.where(valid, right, 0).astype(np.int64)
+        values, valid = func(lhs, rhs, valid)
+        return outcome(values.astype(np.float64), valid)
+    return evaluate
+
+
+def shift_left(lhs: np.ndarray, rhs: np.ndarray, valid: np.ndarray) -> Outcome:
+    # a shift that overflows int64 is an error here, the scalar path would grow the int instead
+    counts = np.clip(rhs, 0, 63)
+    values = np.left_shift(lhs, counts)
+    return values, valid & (rhs == counts) & (np.right_shift(values, counts) == lhs)
+
+
+def shift_right(lhs: np.ndarray, rhs: np.ndarray, valid: np.ndarray) -> Outcome:
+    # shifting by 63 or more leaves only the sign, as it does for Python ints
+    return np.right_shift(lhs, np.clip(rhs, 0, 63)), valid & (rhs >= 0)
+
+
+def masked(func: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Callable[[np.ndarray, np.ndarray, np.ndarray], Outcome]:
+    return lambda lhs, rhs, valid: (func(lhs, rhs), valid)
+
+
+def vector_not(values: np.ndarray) -> Outcome:
+    valid = integral(values)
+    return outcome(np.invert(np.where(valid, values, 0).astype(np.int64)).astype(np.float64), valid)
+
+
+vector_operations = {
+    '^': vector_power,
+    'root': vector_root,
+    'and': vector_bitwise(masked(np.bitwise_and)),
+    'or': vector_bitwise(masked(np.bitwise_or)),
+    'xor': vector_bitwise(masked(np.bitwise_xor)),
+    '<<': vector_bitwise(shift_left),
+    '>>': vector_bitwise(shift_right),
+}
+
+vector_functions: dict[str, Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]]] = {
+    'sin': vector_sine,
+    'cos': vector_cosine,
+    'tan': vector_tangent,
+    'sqrt': guarded(np.sqrt, lambda values: values >= 0),
+    'sqr': guarded(np.square, np.isfinite),
+    'reciprocal': vector_reciprocal,
+    'ln': guarded(np.log, lambda values: values > 0),
+    'log': guarded(np.log10, lambda values: values > 0),
+    'exp': guarded(np.exp, np.isfinite),
+    'exp10': guarded(lambda values: np.power(10.0, values), np.isfinite),
+    'not': vector_not,
+}
+
+
+def evaluate_function_batch(name: str, values) -> tuple[np.ndarray, np.ndarray]:
+    return vector_functions[name](np.asarray(values, dtype=np.float64))
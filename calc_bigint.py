@@ -0,0 +1,122 @@
+import sys
+from decimal import Decimal, Context, Inexact, MAX_PREC, MAX_EMAX, MIN_EMIN
+from functools import lru_cache
+
+
+# below these sizes the builtin conversions are fast and inside the int_max_str_digits limit
+small_int_bits = 2048
+small_str_digits = 600
+
+# leading bits kept when only the first digits of a huge int are needed
+head_bits = 256
+head_context = Context(prec=80, Emax=MAX_EMAX, Emin=MIN_EMIN)
+head_guard_digits = 70
+
+exact_context = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN, traps=[Inexact])
+
+# one conversion splits into two sizes per halving, so this covers any int in memory;
+# the powers are as large as the ints converted and are not kept beyond that
+power_cache_size = 128
+
+
+@lru_cache(maxsize=power_cache_size)
+def decimal_power_of_two(exponent: int) -> Decimal:
+    if exponent <= small_int_bits:
+        return Decimal(1 << exponent)
+    half = decimal_power_of_two(exponent >> 1)
+    power = exact_context.multiply(half, half)
+    if exponent & 1:
+        power = exact_context.multiply(power, 2)
+    return power
+
+
+@lru_cache(maxsize=power_cache_size)
+def power_of_ten(exponent: int) -> int:
+    return 5 ** exponent << exponent
+
+
+def int_to_decimal(value: int) -> Decimal:
+    # split in binary, join with libmpdec's fast multiplication, so the cost stays subquadratic
+    def convert(value: int, bits: int) -> Decimal:
+        if bits <= small_int_bits:
+            return Decimal(value)
+        low_bits = bits >> 1
+        high = value >> low_bits
+        low = value - (high << low_bits)
+        return exact_context.add(exact_context.multiply(convert(high, bits - low_bits),
+                                                        decimal_power_of_two(low_bits)),
+                                 convert(low, low_bits))
+
+    result = convert(abs(value), abs(value).bit_length())
+    return result.copy_negate() if value < 0 else result
+
+
+def int_to_str(value: int) -> str:
+    if value.bit_length() <= small_int_bits:
+        return str(value)
+    return format(int_to_decimal(value), 'f')
+
+
+def str_to_int(text: str) -> int:
+    # int() is quadratic and refuses more than sys.get_int_max_str_digits() digits
+    text = text.strip()
+    digits = text.lstrip('+-')
+    if len(digits) <= small_str_digits:
+        return int(text)
+    if len(text) - len(digits) > 1 or not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f'invalid literal for int(): {text[:20]!r}')
+
+    def convert(start: int, end: int) -> int:
+        if end - start <= small_str_digits:
+            return int(digits[start:end])
+        middle = (start + end + 1) >> 1
+        return convert(start, middle) * power_of_ten(end - middle) + convert(middle, end)
+
+    value = convert(0, len(digits))
+    return -value if text[0] == '-' else value
+
+
+def leading_digits(value: int, count: int) -> tuple[str, int]:
+    # returns the first count digits of abs(value) and how many digits it has, without a full conversion
+    value = abs(value)
+    if value.bit_length() <= small_int_bits:
+        text = str(value)
+        return text[:count], len(text)
+
+    shift = value.bit_length() - head_bits
+    approximation = head_context.multiply(Decimal(value >> shift), head_context.power(Decimal(2), shift))
+    digits = ''.join(map(str, approximation.as_tuple().digits))
+    length = approximation.adjusted() + 1
+
+    # about 75 leading digits are right, a run of nines or zeros after the head could still carry
+    guard = digits[count:head_guard_digits]
+    if guard.strip('9') and guard.strip('0'):
+        return digits[:count], length
+
+    head = value // power_of_ten(length - count)
+    if head >= power_of_ten(count):
+        head //= 10
+        length += 1
+    elif head < power_of_ten(count - 1):
+        head = value // power_of_ten(length - count - 1)
+        length -= 1
+    return str(head), length
+
+
+def compact_int(value: int, max_length: int) -> str:
+    # head...tail in max_length characters plus the sign
+    head_length = (max_length - 1) // 2
+    tail_length = max_length - 1 - head_length
+    head, _ = leading_digits(value, head_length)
+    tail = str(abs(value) % power_of_ten(tail_length)).zfill(tail_length)
+    return f'{"-" if value < 0 else ""}{head}…{tail}'
+
+
+def digit_count(value: int) -> int:
+    return leading_digits(value, 1)[1]
+
+
+def max_str_digits() -> int:
+    # 0 means unlimited, older Pythons have no limit at all
+    getter = getattr(sys, 'get_int_max_str_digits', None)
+    return getter() if getter is not None else 0
@@ -0,0 +1,71 @@
+import sys
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from calc_arithmetic import Number
+
+
+def cache_key(sign: str, left: Number, right: Number) -> tuple:
+    # types are part of the key since 1 == 1.0 == Decimal(1) but their results differ
+    return sign, type(left), left, type(right), right
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[tuple, tuple[Number, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def call(self, sign: str, func: Callable[[Number, Number], Number],
+             left: Number, right: Number) -> Number:
+        result = self.get(sign, left, right)
+        if result is None:
+            result = func(left, right)
+            self.store(sign, left, right, result)
+        return result
+
+    def get(self, sign: str, left: Number, right: Number) -> Optional[Number]:
+        key = cache_key(sign, left, right)
+        cached = self.entries.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return cached[0]
+
+    def store(self, sign: str, left: Number, right: Number, result: Number) -> None:
+        # results computed elsewhere, such as in the worker process, are stored here too
+        size = sys.getsizeof(left) + sys.getsizeof(right) + sys.getsizeof(result)
+        if size <= self.max_bytes:
+            key = cache_key(sign, left, right)
+            if key in self.entries:
+                self.bytes -= self.entries[key][1]
+            self.entries[key] = (result, size)
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        _, (_, size) = self.entries.popitem(last=False)
+        self.bytes -= size
+        self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -8,17 +8,11 @@
 ## WARNING! All changes made in this file will be lost when recompiling UI file!
 ################################################################################
 
-from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
-    QMetaObject, QObject, QPoint, QRect,
-    QSize, QTime, QUrl, Qt)
-from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
-    QFont, QFontDatabase, QGradient, QIcon,
-    QImage, QKeySequence, QLinearGradient, QPainter,
-    QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QApplication, QGridLayout, QLabel, QLineEdit,
-    QMainWindow, QPushButton, QSizePolicy, QVBoxLayout,
-    QWidget)
-import calc_icons
+from PySide6.QtCore import (QCoreApplication, QMetaObject, QSize, Qt)
+from PySide6.QtGui import (QCursor, QIcon)
+from PySide6.QtWidgets import (QGridLayout, QLabel, QLineEdit, QPushButton,
+    QSizePolicy, QVBoxLayout, QWidget)
+from calc_resources import load_icons
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -26,6 +20,7 @@ class Ui_MainWindow(object):
             MainWindow.setObjectName(u"MainWindow")
         MainWindow.resize(300, 500)
         MainWindow.setMinimumSize(QSize(300, 500))
+        load_icons()
         icon = QIcon()
         icon.addFile(u":/icons/calculate_black_24dp.svg", QSize(), QIcon.Normal, QIcon.Off)
         MainWindow.setWindowIcon(icon)
@@ -46,6 +41,10 @@ class Ui_MainWindow(object):
 "\n"
 "QPushButton:pressed {\n"
 "	background-color: #888;\n"
+"}\n"
+"\n"
+"QPushButton:disabled {\n"
+"	color: #888;\n"
 "}")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
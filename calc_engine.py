@@ -0,0 +1,440 @@
+from functools import wraps
+from typing import Callable, Optional
+
+from calc_arithmetic import Number, FloatArithmetic, operations
+from calc_cache import ResultCache
+from calc_expr import ExpressionCompiler, ExpressionError, UndefinedResult
+from calc_format import NumberFormatter
+from calc_functions import functions, percent_of
+from calc_history import History
+from calc_stats import Statistics
+from calc_undo import Pending, Snapshot, UndoStack
+
+
+error_zero_div = 'Division by zero'
+error_undefined = 'Result is undefined'
+error_syntax = 'Invalid expression'
+error_domain = 'Invalid input'
+error_too_large = 'Result is too large'
+
+# what the math behind ^, root and the functions raises outside their domain or range
+domain_errors = (ArithmeticError, ValueError)
+
+default_entry_max_len = 16
+
+
+def zero_division_error(sign: str, left: Number) -> str:
+    # 0 / 0 has no value at all, 0 ^ -1 and 0 root -2 divide by zero like 1 / 0
+    return error_undefined if sign == '/' and left == 0 else error_zero_div
+
+
+def next_preview(sign: str, left: Number, right: Number, last_right: Number, last_value: Number) -> Optional[Number]:
+    # typing, deleting or negating a digit moves an int result by a step that is cheap to apply,
+    # ints stay exact in every backend so the step lands on the same value the operation would give
+    if not all(type(value) is int for value in (left, right, last_right, last_value)):
+        return None
+    if sign == '+':
+        return last_value + (right - last_right)
+    if sign == '-':
+        return last_value - (right - last_right)
+    if sign == 'x':
+        if right == -last_right:
+            return -last_value
+        digit = right - 10 * last_right
+        if -10 < digit < 10:
+            return 10 * last_value + digit * left
+        digit = last_right - 10 * right
+        if -10 < digit < 10:
+            return (last_value - digit * left) // 10
+    return None
+
+
+def undoable(method: Callable) -> Callable:
+    # the state is recorded once the outermost action returns, so nested calls make one undo step
+    @wraps(method)
+    def wrapper(self: 'CalculatorEngine', *args):
+        self.action_depth += 1
+        try:
+            return method(self, *args)
+        finally:
+            self.action_depth -= 1
+            if self.action_depth == 0:
+                self.checkpoint()
+    return wrapper
+
+
+class CalculatorEngine:
+    def __init__(self, entry_max_len: int = default_entry_max_len,
+                 arithmetic: Optional[FloatArithmetic] = None,
+                 cache: Optional[ResultCache] = None,
+                 history: Optional[History] = None,
+                 undo_stack: Optional[UndoStack] = None):
+        self.entry_max_len = entry_max_len
+        self.arithmetic = arithmetic or FloatArithmetic()
+        self.cache = cache
+        self.history = history
+        self.formatter = NumberFormatter(entry_max_len)
+        self.expressions = ExpressionCompiler(self.arithmetic)
+        self.entry = '0'
+        self.entry_value: Optional[Number] = 0
+        self.temp: Optional[Number] = None
+        self.temp_str = ''
+        self.operator: Optional[str] = None
+        self.last_operator: Optional[str] = None
+        self.right_str = ''
+        self.result: Optional[Number] = None
+        self.error: Optional[str] = None
+        self.statistics = Statistics()
+
+        # offload(arithmetic, sign, left, right) returns True when it took over the calculation
+        self.offload: Optional[Callable[[FloatArithmetic, str, Number, Number], bool]] = None
+        self.busy = False
+        self.chain_operator: Optional[str] = None
+
+        self.preview_key: Optional[tuple] = None
+        self.preview_value: Optional[Number] = None
+
+        self.undo_stack = undo_stack or UndoStack()
+        self.action_depth = 0
+        self.checkpoint()
+
+    @property
+    def temp_text(self) -> str:
+        if self.operator is None:
+            return ''
+        if self.operator == '=':
+            return f'{self.temp_str} {self.last_operator} {self.right_str} ='
+        return f'{self.temp_str} {self.operator} '
+
+    @property
+    def entry_limit(self) -> int:
+        if self.error:
+            return len(self.error)
+        return self.entry_max_len + 1 if self.entry[:1] == '-' else self.entry_max_len
+
+    def text_limit(self, text: str) -> int:
+        return self.entry_max_len + 1 if text[:1] == '-' else self.entry_max_len
+
+    def set_entry(self, text: str, value: Optional[Number] = None) -> None:
+        self.entry = text[:self.text_limit(text)]
+        self.entry_value = value
+
+    def parsed(self, text: str) -> Optional[Number]:
+        # edits check their text here, so entry_number never meets one it cannot read
+        try:
+            return self.arithmetic.parse(text)
+        except (ValueError, ArithmeticError):
+            return None
+
+    def entry_number(self) -> Number:
+        if self.entry_value is None:
+            self.entry_value = self.arithmetic.parse(self.entry)
+        return self.entry_value
+
+    @undoable
+    def add_digit(self, digit: str) -> None:
+        if self.busy:
+            return
+        self.remove_error()
+        entry = self.entry
+        if entry == '0':
+            self.set_entry(digit, int(digit))
+            return
+
+        text = entry + digit
+        if len(text) > self.text_limit(text):
+            return
+
+        # plain integer entries are updated in place instead of being parsed again,
+        # a result shown as 1e+17 or head…tail is not its digits
+        value = self.entry_value
+        if type(value) is int and entry.lstrip('-').isdigit():
+            value = value * 10 - int(digit) if entry[0] == '-' else value * 10 + int(digit)
+        else:
+            # a digit after inf or nan makes no number, the entry is left as it is
+            value = self.parsed(text)
+            if value is None:
+                return
+        self.set_entry(text, value)
+
+    @undoable
+    def clear_all(self) -> None:
+        self.cancel_calculation()
+        self.remove_error()
+        self.set_entry('0', 0)
+        self.temp = None
+        self.temp_str = ''
+        self.operator = None
+        self.last_operator = None
+        self.right_str = ''
+        self.result = None
+
+    @undoable
+    def clear_entry(self) -> None:
+        self.cancel_calculation()
+        self.remove_error()
+        self.set_entry('0', 0)
+
+    @undoable
+    def add_point(self) -> None:
+        # a head...tail entry has no digits to put a point between
+        if not self.busy and self.error is None and '.' not in self.entry and '…' not in self.entry:
+            self.set_entry(self.entry + '.')
+
+    @undoable
+    def negate(self) -> None:
+        if self.busy or self.error is not None:
+            return
+        value = None if self.entry_value is None else -self.entry_value
+        if self.entry[:1] == '-':
+            self.set_entry(self.entry[1:], value)
+        elif self.entry != '0':
+            self.set_entry('-' + self.entry, value)
+
+    @undoable
+    def backspace(self) -> None:
+        if self.busy:
+            return
+        self.remove_error()
+        entry = self.entry
+
+        if len(entry) == 1 or (len(entry) == 2 and entry[0] == '-'):
+            self.set_entry('0', 0)
+        elif type(self.entry_value) is int and entry.lstrip('-').isdigit():
+            value = self.entry_value
+            self.set_entry(entry[:-1], value // 10 if value >= 0 else -(-value // 10))
+        else:
+            # a head…tail entry has lost its middle digits and 1e+ or in are no numbers, those start over
+            value = self.parsed(entry[:-1])
+            if value is None:
+                self.set_entry('0', 0)
+            else:
+                self.set_entry(entry[:-1], value)
+
+    def add_temp(self, math_sign: str) -> None:
+        self.temp = self.entry_number()
+        self.temp_str = self.formatter.format(self.temp)
+        self.operator = math_sign
+        self.set_entry('0', 0)
+
+    @undoable
+    def calculate(self) -> Optional[str]:
+        if self.busy or self.error is not None or self.operator is None or self.operator == '=':
+            return None
+
+        left, right = self.temp, self.entry_number()
+        # a repeated expensive calculation comes from the cache before it could go to the worker
+        value = None if self.cache is None else self.cache.get(self.operator, left, right)
+        if value is not None:
+            return self.finish_calculation(value)
+        if self.offload is not None and self.offload(self.arithmetic, self.operator, left, right):
+            self.busy = True
+            return None
+
+        try:
+            value = self.arithmetic.operations[self.operator](left, right)
+        except ZeroDivisionError:
+            self.show_error(zero_division_error(self.operator, left))
+            return None
+        except domain_errors:
+            self.show_error(error_domain)
+            return None
+        if self.cache is not None:
+            self.cache.store(self.operator, left, right, value)
+        return self.finish_calculation(value)
+
+    @undoable
+    def finish_calculation(self, value: Number) -> str:
+        if self.busy and self.cache is not None:
+            # the worker's result, kept so the same calculation is not sent to it again
+            self.cache.store(self.operator, self.temp, self.entry_number(), value)
+        self.busy = False
+        result = self.formatter.format(value)
+        self.right_str = self.formatter.format(self.entry_number())
+        self.last_operator = self.operator
+        self.operator = '='
+        self.result = value
+        self.set_entry(result, value)
+        if self.history is not None:
+            self.history.append(self.temp_str, self.last_operator, self.right_str, result, value)
+
+        if self.chain_operator is not None:
+            self.temp = value
+            self.temp_str = result
+            self.operator = self.chain_operator
+            self.chain_operator = None
+        return result
+
+    @undoable
+    def fail_calculation(self, error: Exception) -> None:
+        self.busy = False
+        self.chain_operator = None
+        if isinstance(error, ZeroDivisionError):
+            self.show_error(zero_division_error(self.operator, self.temp))
+        elif isinstance(error, domain_errors):
+            self.show_error(error_domain)
+        elif isinstance(error, MemoryError):
+            self.show_error(error_too_large)
+        else:
+            raise error
+
+    def cancel_calculation(self) -> None:
+        self.busy = False
+        self.chain_operator = None
+
+    @undoable
+    def math_operation(self, math_sign: str) -> None:
+        if self.busy or self.error is not None:
+            return
+
+        if self.operator is None or self.operator == '=':
+            self.add_temp(math_sign)
+        elif self.operator != math_sign:
+            self.operator = math_sign
+        else:
+            self.chain_operator = math_sign
+            if self.calculate() is None and not self.busy:
+                self.chain_operator = None
+
+    @undoable
+    def apply_function(self, name: str) -> None:
+        if self.busy or self.error is not None:
+            return
+        value = self.entry_number()
+        try:
+            value = functions[name](self.arithmetic, value)
+        except ZeroDivisionError:
+            self.show_error(error_zero_div)
+        except domain_errors:
+            self.show_error(error_domain)
+        else:
+            self.set_entry(self.formatter.format(value), value)
+
+    @undoable
+    def percent(self) -> None:
+        # after + or - the entry is a percentage of the pending operand, otherwise a fraction of one
+        if self.busy or self.error is not None:
+            return
+        base = self.temp if self.operator in ('+', '-') else 1
+        value = percent_of(self.arithmetic, base, self.entry_number())
+        self.set_entry(self.formatter.format(value), value)
+
+    @undoable
+    def add_statistic(self) -> None:
+        # the entry goes back to 0 so the next value can be typed straight away
+        if self.busy or self.error is not None:
+            return
+        try:
+            self.statistics = self.statistics.added(self.entry_number(), self.arithmetic)
+        except domain_errors:
+            self.show_error(error_domain)
+        else:
+            self.set_entry('0', 0)
+
+    @undoable
+    def merge_statistics(self, statistics: Statistics) -> None:
+        self.statistics = self.statistics.merged(statistics, self.arithmetic)
+
+    @undoable
+    def clear_statistics(self) -> None:
+        self.statistics = Statistics()
+
+    @undoable
+    def recall_statistic(self, name: str) -> None:
+        if self.busy:
+            return
+        value = self.statistics.values(self.arithmetic)[name]
+        if value is not None:
+            self.remove_error()
+            self.set_entry(self.formatter.format(value), value)
+
+    @undoable
+    def enter_expression(self, source: str) -> None:
+        if self.busy:
+            return
+        self.remove_error()
+        try:
+            value = self.expressions.evaluate(source)
+        except ExpressionError:
+            self.show_error(error_syntax)
+        except UndefinedResult:
+            self.show_error(error_undefined)
+        except ZeroDivisionError:
+            self.show_error(error_zero_div)
+        except domain_errors:
+            self.show_error(error_domain)
+        else:
+            self.set_entry(self.formatter.format(value), value)
+
+    def preview(self, max_cost: Optional[int] = None) -> Optional[Number]:
+        if self.busy or self.error is not None or self.operator is None or self.operator == '=':
+            return None
+
+        left, right = self.temp, self.entry_number()
+        key = (self.operator, left, right)
+        if key == self.preview_key:
+            return self.preview_value
+
+        value = None
+        last = self.preview_key
+        if last is not None and self.preview_value is not None and last[:2] == key[:2]:
+            value = next_preview(self.operator, left, right, last[2], self.preview_value)
+        if value is None and (max_cost is None or self.arithmetic.cost(self.operator, left, right) <= max_cost):
+            func = self.arithmetic.operations[self.operator]
+            try:
+                if self.cache is None:
+                    value = func(left, right)
+                else:
+                    value = self.cache.call(self.operator, func, left, right)
+            except domain_errors:
+                pass
+
+        self.preview_key = key
+        self.preview_value = value
+        return value
+
+    def checkpoint(self) -> None:
+        current = self.undo_stack.current
+        state = (self.temp, self.temp_str, self.operator, self.last_operator, self.right_str, self.result,
+                 self.statistics)
+        if current is not None and current.pending.matches(*state):
+            pending = current.pending
+        else:
+            pending = Pending(*state)
+        self.undo_stack.record(Snapshot(self.entry, self.entry_value, self.error, pending))
+
+    def restore(self, snapshot: Snapshot) -> None:
+        pending = snapshot.pending
+        self.entry = snapshot.entry
+        self.entry_value = snapshot.entry_value
+        self.error = snapshot.error
+        self.temp = pending.temp
+        self.temp_str = pending.temp_str
+        self.operator = pending.operator
+        self.last_operator = pending.last_operator
+        self.right_str = pending.right_str
+        self.result = pending.result
+        self.statistics = pending.statistics
+        self.chain_operator = None
+
+    def undo(self) -> None:
+        if not self.busy:
+            snapshot = self.undo_stack.undo()
+            if snapshot is not None:
+                self.restore(snapshot)
+
+    def redo(self) -> None:
+        if not self.busy:
+            snapshot = self.undo_stack.redo()
+            if snapshot is not None:
+                self.restore(snapshot)
+
+    def show_error(self, text: str) -> None:
+        self.error = text
+        self.entry = text
+        self.entry_value = None
+
+    def remove_error(self) -> None:
+        if self.error is not None:
+            self.error = None
+            self.set_entry('0', 0)
@@ -0,0 +1,228 @@
+import re
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional
+
+from calc_arithmetic import Number, FloatArithmetic
+from calc_functions import functions
+
+
+Evaluator = Callable[[dict], Number]
+
+# 'x' on its own is multiplication, so names may only start with it when a letter follows
+token_pattern = re.compile(r'''
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>(?!x(?![A-Za-z_]))[A-Za-z_][A-Za-z_0-9]*)
+      | (?P<symbol>\S)
+    )''', re.VERBOSE)
+
+binary_precedence = {'+': 1, '-': 1, 'x': 2, '/': 2}
+symbol_aliases = {'*': 'x', '×': 'x', '÷': '/', '−': '-'}
+
+# binds tighter than negation and to the right, so -2^2 is -4 and 2^3^2 is 2^9
+power_sign = '^'
+
+# expressions evaluate on the calling thread, a power costing more is refused rather than freezing it.
+# the same operand bit-size product at which the GUI hands a calculation to its worker
+default_max_cost = 10 ** 9
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+class UndefinedResult(ZeroDivisionError):
+    pass
+
+
+def tokenize(source: str) -> Iterator[tuple[str, str]]:
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = token_pattern.match(source, position)
+        if match is None:
+            break
+        position = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'symbol':
+            text = symbol_aliases.get(text, text)
+            if text not in binary_precedence and text not in '()' and text != power_sign:
+                raise ExpressionError(f'unexpected {text!r}')
+        yield kind, text
+
+
+def normalize(source: str) -> str:
+    return ' '.join(text for _, text in tokenize(source))
+
+
+class Parser:
+    def __init__(self, source: str):
+        self.tokens = list(tokenize(source))
+        self.position = 0
+
+    def peek(self) -> Optional[tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ExpressionError('unexpected end of expression')
+        self.position += 1
+        return token
+
+    def parse(self) -> tuple:
+        if not self.tokens:
+            raise ExpressionError('empty expression')
+        tree = self.parse_binary(1)
+        if self.peek() is not None:
+            raise ExpressionError(f'unexpected {self.peek()[1]!r}')
+        return tree
+
+    def parse_binary(self, min_precedence: int) -> tuple:
+        left = self.parse_unary()
+        while True:
+            token = self.peek()
+            if token is None or token[0] != 'symbol' or token[1] not in binary_precedence:
+                return left
+            precedence = binary_precedence[token[1]]
+            if precedence < min_precedence:
+                return left
+            self.position += 1
+            left = ('binary', token[1], left, self.parse_binary(precedence + 1))
+
+    def parse_unary(self) -> tuple:
+        token = self.peek()
+        if token is not None and token[0] == 'symbol' and token[1] in '+-':
+            self.position += 1
+            operand = self.parse_unary()
+            return ('negate', operand) if token[1] == '-' else operand
+        return self.parse_power()
+
+    def parse_power(self) -> tuple:
+        base = self.parse_primary()
+        if self.peek() != ('symbol', power_sign):
+            return base
+        self.position += 1
+        return 'binary', power_sign, base, self.parse_unary()
+
+    def parse_primary(self) -> tuple:
+        kind, text = self.take()
+        if kind == 'number':
+            return 'number', text
+        if kind == 'name':
+            if self.peek() == ('symbol', '('):
+                return 'call', text, self.parse_primary()
+            return 'name', text
+        if text == '(':
+            tree = self.parse_binary(1)
+            if self.take()[1] != ')':
+                raise ExpressionError('expected )')
+            return tree
+        raise ExpressionError(f'unexpected {text!r}')
+
+
+class CompiledExpression:
+    def __init__(self, source: str, evaluate: Evaluator, variables: frozenset):
+        self.source = source
+        self.evaluate = evaluate
+        self.variables = variables
+
+    def __call__(self, **values: Number) -> Number:
+        missing = self.variables.difference(values)
+        if missing:
+            raise ExpressionError(f'missing values for {", ".join(sorted(missing))}')
+        return self.evaluate(values)
+
+
+class ExpressionCompiler:
+    def __init__(self, arithmetic: Optional[FloatArithmetic] = None, cache_size: int = 256,
+                 max_cost: Optional[int] = default_max_cost):
+        self.arithmetic = arithmetic or FloatArithmetic()
+        self.cache_size = cache_size
+        self.max_cost = max_cost
+        self.cache: OrderedDict[str, CompiledExpression] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, source: str) -> CompiledExpression:
+        key = normalize(source)
+        compiled = self.cache.get(key)
+        if compiled is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        variables = set()
+        evaluate, _ = self.build(Parser(key).parse(), variables)
+        compiled = CompiledExpression(key, evaluate, frozenset(variables))
+        self.cache[key] = compiled
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return compiled
+
+    def evaluate(self, source: str, **values: Number) -> Number:
+        return self.compile(source)(**values)
+
+    def build(self, tree: tuple, variables: set) -> tuple[Evaluator, bool]:
+        # returns the evaluator and whether it is constant, so constant subtrees fold at compile time
+        kind = tree[0]
+        if kind == 'number':
+            try:
+                value = self.arithmetic.parse(tree[1])
+            except (ValueError, ArithmeticError):
+                raise ExpressionError(f'invalid number {tree[1]!r}')
+            return (lambda values: value), True
+
+        if kind == 'name':
+            name = tree[1]
+            variables.add(name)
+            return (lambda values: values[name]), False
+
+        if kind == 'negate':
+            operand, constant = self.build(tree[1], variables)
+            evaluate = lambda values: -operand(values)
+        elif kind == 'call':
+            _, name, argument_tree = tree
+            if name not in functions:
+                raise ExpressionError(f'unknown function {name!r}')
+            argument, constant = self.build(argument_tree, variables)
+            function, arithmetic = functions[name], self.arithmetic
+            evaluate = lambda values: function(arithmetic, argument(values))
+        else:
+            _, sign, left_tree, right_tree = tree
+            left, left_constant = self.build(left_tree, variables)
+            right, right_constant = self.build(right_tree, variables)
+            constant = left_constant and right_constant
+            func = self.arithmetic.operations[sign]
+
+            if sign == '/':
+                def evaluate(values: dict) -> Number:
+                    dividend = left(values)
+                    try:
+                        return func(dividend, right(values))
+                    except ZeroDivisionError:
+                        if dividend == 0:
+                            raise UndefinedResult('division of zero by zero')
+                        raise
+            elif sign == power_sign and self.max_cost is not None:
+                cost, max_cost = self.arithmetic.cost, self.max_cost
+
+                def evaluate(values: dict) -> Number:
+                    base, exponent = left(values), right(values)
+                    if cost(sign, base, exponent) > max_cost:
+                        raise OverflowError('power too large to evaluate')
+                    return func(base, exponent)
+            else:
+                def evaluate(values: dict) -> Number:
+                    return func(left(values), right(values))
+
+        if constant:
+            try:
+                value = evaluate({})
+            except (ArithmeticError, ValueError):
+                # left to fail at evaluation time, where the caller reports it
+                return evaluate, False
+            return (lambda values: value), True
+        return evaluate, False
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+
+from PySide6.QtGui import QFont, QFontMetrics
+
+
+class FontFitter:
+    def __init__(self, font: QFont, min_size: int = 1, max_size: int = 40,
+                 margin: int = 15, cache_size: int = 1024):
+        self.font = QFont(font)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.margin = margin
+        self.cache_size = cache_size
+
+        self.metrics: dict[int, QFontMetrics] = {}
+        self.widths: OrderedDict[tuple[str, int], int] = OrderedDict()
+        self.sizes: OrderedDict[tuple[str, int], int] = OrderedDict()
+
+    def get_metrics(self, size: int) -> QFontMetrics:
+        metrics = self.metrics.get(size)
+        if metrics is None:
+            font = QFont(self.font)
+            font.setPointSize(size)
+            metrics = self.metrics[size] = QFontMetrics(font)
+        return metrics
+
+    def text_width(self, text: str, size: int) -> int:
+        key = (text, size)
+        width = self.widths.get(key)
+        if width is None:
+            width = self.get_metrics(size).boundingRect(text).width()
+            self.remember(self.widths, key, width)
+        else:
+            self.widths.move_to_end(key)
+        return width
+
+    def fit(self, text: str, widget_width: int) -> int:
+        key = (text, widget_width)
+        size = self.sizes.get(key)
+        if size is not None:
+            self.sizes.move_to_end(key)
+            return size
+
+        # largest point size whose text still fits, widths grow with size
+        available = widget_width - self.margin
+        low, high = self.min_size, self.max_size
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.text_width(text, middle) <= available:
+                low = middle
+            else:
+                high = middle - 1
+
+        self.remember(self.sizes, key, low)
+        return low
+
+    def remember(self, cache: OrderedDict, key: tuple, value: int) -> None:
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self.metrics.clear()
+        self.widths.clear()
+        self.sizes.clear()
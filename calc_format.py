@@ -0,0 +1,100 @@
+from decimal import Decimal, Context, ROUND_HALF_EVEN, MAX_EMAX, MIN_EMIN
+from fractions import Fraction
+from typing import Optional, Union
+
+from calc_bigint import int_to_str, compact_int
+
+
+Value = Union[int, float, Decimal, Fraction]
+
+# wide exponent range so huge results format instead of overflowing the default context
+format_context = Context(prec=28, rounding=ROUND_HALF_EVEN, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# ints past the float range are shown as head...tail instead of in scientific notation
+compact_int_bits = 1024
+
+# whole floats below this are written out as integers, past it their trailing digits are binary noise
+exact_float_int = 2 ** 53
+
+
+def approximate_int(value: int) -> Decimal:
+    # converting every digit of a huge int is quadratic, a display only needs the leading ones
+    shift = value.bit_length() - 128
+    if shift <= 0:
+        return Decimal(value)
+    return format_context.multiply(Decimal(value >> shift), format_context.power(Decimal(2), shift))
+
+
+class NumberFormatter:
+    def __init__(self, max_length: Optional[int] = 16, min_exponent: int = -5):
+        # max_length counts digits, point and exponent but not the sign
+        self.max_length = max_length
+        self.min_exponent = min_exponent
+        self.int_limit = 10 ** max_length if max_length else None
+        self.float_int_limit = self.int_limit or exact_float_int
+
+    def format(self, value: Value) -> str:
+        if type(value) is int:
+            if self.int_limit is None:
+                return int_to_str(value)
+            if -self.int_limit < value < self.int_limit:
+                return str(value)
+            if value.bit_length() > compact_int_bits:
+                return compact_int(value, self.max_length)
+            return self.fit(approximate_int(value))
+
+        if isinstance(value, float):
+            if value.is_integer() and -self.float_int_limit < value < self.float_int_limit:
+                return str(int(value))
+            # repr is the shortest string that round-trips
+            text = repr(value)
+            if self.max_length is None or len(text.lstrip('-')) <= self.max_length:
+                return text
+            return self.fit(Decimal(value))
+
+        if isinstance(value, Fraction):
+            if value.denominator == 1:
+                return self.format(value.numerator)
+            if self.max_length is None:
+                return f'{int_to_str(value.numerator)}/{int_to_str(value.denominator)}'
+            return self.fit(format_context.divide(Decimal(value.numerator), Decimal(value.denominator)))
+
+        if not value.is_finite():
+            return str(value)
+        if value == value.to_integral_value():
+            return self.format(int(value))
+        text = format(value.normalize(), 'f')
+        if self.max_length is None or len(text.lstrip('-')) <= self.max_length:
+            return text
+        return self.fit(value)
+
+    def fit(self, value: Decimal) -> str:
+        sign = '-' if value.is_signed() else ''
+        value = value.copy_abs()
+        exponent = value.adjusted()
+
+        if self.min_exponent <= exponent < self.max_length:
+            places = self.max_length - max(exponent + 1, 1) - 1
+            text = format(value.quantize(Decimal(1).scaleb(-places), context=format_context), 'f')
+            if '.' in text:
+                text = text.rstrip('0').rstrip('.')
+            if len(text) <= self.max_length:
+                return sign + text
+
+        return sign + self.scientific(value, exponent)
+
+    def scientific(self, value: Decimal, exponent: int) -> str:
+        mantissa = value.scaleb(-exponent, context=format_context)
+        suffix = f'e{exponent:+03d}'
+        places = max(self.max_length - len(suffix) - 2, 0)
+        rounded = mantissa.quantize(Decimal(1).scaleb(-places), context=format_context)
+        if rounded >= 10:
+            return self.scientific(value, exponent + 1)
+
+        text = format(rounded, 'f')
+        if '.' in text:
+            text = text.rstrip('0').rstrip('.')
+        return text + suffix
+
+
+format_number = NumberFormatter(max_length=None).format
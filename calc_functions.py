@@ -0,0 +1,136 @@
+import math
+from decimal import Decimal
+from fractions import Fraction
+from typing import Callable
+
+from calc_arithmetic import Number, FloatArithmetic, as_integer
+from calc_bigint import leading_digits, power_of_ten
+
+
+# angles are in degrees, multiples of 30 and 45 come from tables so sin(180) is 0, not 1.2e-16
+exact_sines = {0: 0.0, 30: 0.5, 90: 1.0, 150: 0.5, 180: 0.0, 210: -0.5, 270: -1.0, 330: -0.5}
+exact_tangents = {0: 0.0, 45: 1.0, 135: -1.0, 180: 0.0, 225: 1.0, 315: -1.0}
+undefined_tangents = (90, 270)
+
+# correctly rounded powers of ten for whole exponents, pow(10.0, n) may be off by an ulp
+min_ten_exponent = -323
+max_ten_exponent = 308
+powers_of_ten = tuple(float(f'1e{exponent}') for exponent in range(min_ten_exponent, max_ten_exponent + 1))
+
+# 10 ** n is computed exactly up to here, further out it is refused rather than hanging the GUI
+max_exact_ten_exponent = 10_000
+
+
+def reduce_degrees(value: Number) -> float:
+    # exact for ints, Decimals and Fractions, float % is exact as well
+    if type(value) is not float:
+        value = value % 360
+    return float(value) % 360.0
+
+
+def sine(arithmetic: FloatArithmetic, value: Number) -> Number:
+    # computed in floats whatever the backend, then handed back in its own type
+    angle = reduce_degrees(value)
+    exact = exact_sines.get(angle)
+    if exact is None:
+        exact = math.sin(math.radians(angle))
+    return arithmetic.coerce(exact)
+
+
+def cosine(arithmetic: FloatArithmetic, value: Number) -> Number:
+    return sine(arithmetic, reduce_degrees(value) + 90.0)
+
+
+def tangent(arithmetic: FloatArithmetic, value: Number) -> Number:
+    angle = reduce_degrees(value)
+    if angle in undefined_tangents:
+        raise ValueError('tangent of a right angle')
+    exact = exact_tangents.get(angle)
+    if exact is None:
+        exact = math.tan(math.radians(angle))
+    return arithmetic.coerce(exact)
+
+
+def square_root(arithmetic: FloatArithmetic, value: Number) -> Number:
+    if isinstance(value, Fraction):
+        numerator, denominator = math.isqrt(value.numerator), math.isqrt(value.denominator)
+        if value >= 0 and numerator * numerator == value.numerator and denominator * denominator == value.denominator:
+            return Fraction(numerator, denominator)
+    return arithmetic.operations['root'](value, 2)
+
+
+def square(arithmetic: FloatArithmetic, value: Number) -> Number:
+    return arithmetic.operations['x'](value, value)
+
+
+def reciprocal(arithmetic: FloatArithmetic, value: Number) -> Number:
+    return arithmetic.operations['/'](1, value)
+
+
+def natural_log(arithmetic: FloatArithmetic, value: Number) -> Number:
+    if value <= 0:
+        raise ValueError('logarithm of a non-positive number')
+    context = getattr(arithmetic, 'context', None)
+    if context is not None:
+        return context.ln(Decimal(value))
+    # math.log accepts ints of any size
+    return math.log(value)
+
+
+def common_log(arithmetic: FloatArithmetic, value: Number) -> Number:
+    if value <= 0:
+        raise ValueError('logarithm of a non-positive number')
+    if type(value) is int and value % 10 == 0:
+        # math.log10(10 ** 443) is not exactly 443
+        head, length = leading_digits(value, 1)
+        if head == '1' and value == power_of_ten(length - 1):
+            return length - 1
+    context = getattr(arithmetic, 'context', None)
+    if context is not None:
+        return context.log10(Decimal(value))
+    return math.log10(value)
+
+
+def exponential(arithmetic: FloatArithmetic, value: Number) -> Number:
+    context = getattr(arithmetic, 'context', None)
+    if context is not None:
+        return context.exp(Decimal(value))
+    return math.exp(value)
+
+
+def exp10(arithmetic: FloatArithmetic, value: Number) -> Number:
+    if value != int(value):
+        return arithmetic.operations['^'](10, value)
+    exponent = int(value)
+    if abs(exponent) > max_exact_ten_exponent:
+        raise OverflowError('power of ten out of range')
+    if exponent >= 0:
+        return power_of_ten(exponent)
+    if type(arithmetic) is FloatArithmetic and exponent >= min_ten_exponent:
+        return powers_of_ten[exponent - min_ten_exponent]
+    return arithmetic.operations['/'](1, power_of_ten(-exponent))
+
+
+def bitwise_not(arithmetic: FloatArithmetic, value: Number) -> Number:
+    # ints are unbounded two's complement, so NOT x is -x - 1
+    return ~as_integer(value)
+
+
+functions: dict[str, Callable[[FloatArithmetic, Number], Number]] = {
+    'sin': sine,
+    'cos': cosine,
+    'tan': tangent,
+    'sqrt': square_root,
+    'sqr': square,
+    'reciprocal': reciprocal,
+    'ln': natural_log,
+    'log': common_log,
+    'exp': exponential,
+    'exp10': exp10,
+    'not': bitwise_not,
+}
+
+
+def percent_of(arithmetic: FloatArithmetic, base: Number, value: Number) -> Number:
+    # value percent of base
+    return arithmetic.operations['/'](arithmetic.operations['x'](base, value), 100)
@@ -0,0 +1,122 @@
+import os
+import mmap
+import time
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple, Optional
+
+from calc_arithmetic import Number
+
+
+history_magic = b'CALCHIS2'
+
+# timestamp, result value, operator, left, right and result as displayed.
+# operators are named as in the operations table, 'root' and 'xor' do not fit one byte
+operator_width = 8
+record_struct = struct.Struct(f'<dd{operator_width}s24s24s24s')
+result_offset = 8
+
+
+class HistoryEntry(NamedTuple):
+    timestamp: float
+    left: str
+    operator: str
+    right: str
+    result: str
+    value: float
+
+
+def search_key(value: Number) -> float:
+    # results are indexed as floats, ints too large for a float sort at either end
+    try:
+        return float(value)
+    except OverflowError:
+        return float('inf') if value > 0 else float('-inf')
+
+
+class History:
+    def __init__(self, path: str):
+        self.path = path
+        # only a new or empty file becomes a tape, anything else has to carry the magic
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as file:
+                file.write(history_magic)
+
+        with open(path, 'rb') as file:
+            magic = file.read(len(history_magic))
+        if magic != history_magic:
+            raise ValueError(f'{path} is not a calculator history file')
+
+        # a record torn by a crash mid-write is cut off, appending after it would shift every later record
+        self.count = (os.path.getsize(path) - len(history_magic)) // record_struct.size
+        whole_size = len(history_magic) + self.count * record_struct.size
+        if os.path.getsize(path) != whole_size:
+            os.truncate(path, whole_size)
+        self.file = open(path, 'ab')
+        self.map: Optional[mmap.mmap] = None
+        self.mapped_count = 0
+
+        # sorted result values and their rows, built on the first search
+        self.index_values: Optional[array] = None
+        self.index_rows: Optional[array] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, left: str, operator: str, right: str, result: str, value: Number) -> None:
+        value = search_key(value)
+        self.file.write(record_struct.pack(time.time(), value, operator.encode(),
+                                           left.encode(), right.encode(), result.encode()))
+        self.file.flush()
+
+        if self.index_values is not None:
+            position = bisect_right(self.index_values, value)
+            self.index_values.insert(position, value)
+            self.index_rows.insert(position, self.count)
+        self.count += 1
+
+    def remap(self) -> None:
+        if self.map is not None:
+            self.map.close()
+        with open(self.path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mapped_count = (len(self.map) - len(history_magic)) // record_struct.size
+
+    def offset(self, row: int) -> int:
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        if self.map is None or row >= self.mapped_count:
+            self.remap()
+        return len(history_magic) + row * record_struct.size
+
+    def __getitem__(self, row: int) -> HistoryEntry:
+        offset = self.offset(row)
+        timestamp, value, operator, left, right, result = record_struct.unpack_from(self.map, offset)
+        return HistoryEntry(timestamp, left.rstrip(b'\0').decode(), operator.rstrip(b'\0').decode(),
+                            right.rstrip(b'\0').decode(), result.rstrip(b'\0').decode(), value)
+
+    def build_index(self) -> None:
+        if self.count:
+            self.offset(self.count - 1)
+        values = [struct.unpack_from('<d', self.map, len(history_magic) + row * record_struct.size + result_offset)[0]
+                  for row in range(self.count)]
+        rows = sorted(range(self.count), key=values.__getitem__)
+        self.index_values = array('d', (values[row] for row in rows))
+        self.index_rows = array('L', rows)
+
+    def search(self, low: Number, high: Optional[Number] = None) -> list[int]:
+        # rows whose result value is low, or lies in [low, high]
+        if self.index_values is None:
+            self.build_index()
+        low = search_key(low)
+        high = low if high is None else search_key(high)
+        start = bisect_left(self.index_values, low)
+        end = bisect_right(self.index_values, high)
+        return sorted(self.index_rows[start:end])
+
+    def close(self) -> None:
+        self.file.close()
+        if self.map is not None:
+            self.map.close()
+            self.map = None
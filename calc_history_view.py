@@ -0,0 +1,84 @@
+import time
+from typing import Any, Optional
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListView
+
+from calc_history import History
+
+
+class HistoryModel(QAbstractListModel):
+    # rows are read from the mapped file only when the view asks for them
+    def __init__(self, history: History, parent: Optional[QWidget] = None):
+        super(HistoryModel, self).__init__(parent)
+        self.history = history
+        self.rows: Optional[list[int]] = None
+        self.synced_count = len(history)
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.synced_count if self.rows is None else len(self.rows)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        # newest first
+        row = self.synced_count - 1 - index.row() if self.rows is None else self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            entry = self.history[row]
+            return f'{entry.left} {entry.operator} {entry.right} = {entry.result}'
+        if role == Qt.ToolTipRole:
+            return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.history[row].timestamp))
+        return None
+
+    def sync(self) -> None:
+        count = len(self.history)
+        if count == self.synced_count:
+            return
+        if self.rows is not None:
+            self.synced_count = count
+            return
+        self.beginInsertRows(QModelIndex(), 0, count - self.synced_count - 1)
+        self.synced_count = count
+        self.endInsertRows()
+
+    def set_rows(self, rows: Optional[list[int]]) -> None:
+        self.beginResetModel()
+        self.synced_count = len(self.history)
+        self.rows = None if rows is None else rows[::-1]
+        self.endResetModel()
+
+
+class HistoryView(QWidget):
+    def __init__(self, history: History, parent: Optional[QWidget] = None):
+        super(HistoryView, self).__init__(parent, Qt.Tool)
+        self.setWindowTitle('History')
+        self.resize(320, 400)
+
+        self.model = HistoryModel(history, self)
+
+        self.le_search = QLineEdit(self)
+        self.le_search.setPlaceholderText('Find result')
+        self.le_search.textChanged.connect(self.search)
+
+        self.list_view = QListView(self)
+        # uniform rows let the view compute the scroll range without touching every row
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.model)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.le_search)
+        layout.addWidget(self.list_view)
+
+    def search(self, text: str) -> None:
+        text = text.strip()
+        if not text:
+            self.model.set_rows(None)
+            return
+        try:
+            value = float(text)
+        except ValueError:
+            self.model.set_rows([])
+            return
+        self.model.set_rows(self.model.history.search(value))
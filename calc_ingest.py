@@ -0,0 +1,117 @@
+import io
+import os
+import sys
+import mmap
+import argparse
+from itertools import repeat
+from time import perf_counter
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from calc_format import format_number
+from calc_parallel import chunk_bounds
+from calc_stats import Statistics
+
+
+# csv text is parsed this many bytes at a time, binary columns this many values at a time
+default_chunk_bytes = 16 * 1024 * 1024
+default_chunk_values = 1 << 21
+
+# raw little-endian float64 columns, .npy files carry their own header
+binary_suffixes = ('.bin', '.f64')
+
+
+def chunk_statistics(values: np.ndarray) -> Statistics:
+    # NaNs are empty cells, they are not counted
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return Statistics()
+    mean = float(values.mean())
+    return Statistics(len(values), mean, float(np.square(values - mean).sum()), float(values.sum()),
+                      float(values.min()), float(values.max()))
+
+
+def header_length(data: mmap.mmap, column: int) -> int:
+    # a first line whose column is not a number is a header and is skipped
+    end = data.find(b'\n')
+    end = len(data) if end < 0 else end + 1
+    fields = data[:end].split(b',')
+    try:
+        field = fields[column].strip()
+        if field:
+            float(field)
+    except (IndexError, ValueError):
+        return end
+    return 0
+
+
+def csv_chunk_statistics(path: str, start: int, end: int, column: int) -> Statistics:
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end]
+    if not text.strip():
+        return Statistics()
+    # empty cells read as NaN, which chunk_statistics leaves out
+    values = np.genfromtxt(io.BytesIO(text), delimiter=',', usecols=column, dtype=np.float64,
+                           comments='#', filling_values=np.nan)
+    return chunk_statistics(np.atleast_1d(values))
+
+
+def array_statistics(values: np.ndarray, chunk_values: int) -> Statistics:
+    statistics = Statistics()
+    for start in range(0, len(values), chunk_values):
+        chunk = np.asarray(values[start:start + chunk_values], dtype=np.float64)
+        statistics = statistics.merged(chunk_statistics(chunk))
+    return statistics
+
+
+def ingest(path: str, column: int = 0, chunk_bytes: int = default_chunk_bytes,
+           chunk_values: int = default_chunk_values, jobs: Optional[int] = 1) -> Statistics:
+    # memory-mapped, so only one chunk of the file is in memory at a time per process
+    if os.path.getsize(path) == 0:
+        return Statistics()
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == '.npy':
+        values = np.load(path, mmap_mode='r')
+        return array_statistics(values[:, column] if values.ndim == 2 else values, chunk_values)
+    if suffix in binary_suffixes:
+        return array_statistics(np.memmap(path, dtype='<f8', mode='r'), chunk_values)
+
+    # parsing text is the slow part, chunks are independent and their results merge in any grouping
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = header_length(data, column)
+    bounds = chunk_bounds(path, chunk_bytes, start)
+    statistics = Statistics()
+    if jobs == 1 or len(bounds) < 2:
+        for start, end in bounds:
+            statistics = statistics.merged(csv_chunk_statistics(path, start, end, column))
+        return statistics
+    starts, ends = zip(*bounds)
+    with ProcessPoolExecutor(jobs) as executor:
+        for chunk in executor.map(csv_chunk_statistics, repeat(path), starts, ends, repeat(column)):
+            statistics = statistics.merged(chunk)
+    return statistics
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description='Count, sum, mean, variance, min and max of a csv or binary column')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--column', type=int, default=0, help='zero-based csv or .npy column')
+    parser.add_argument('--chunk-mb', type=float, default=default_chunk_bytes / 1024 / 1024)
+    parser.add_argument('--jobs', type=int, default=None, help='csv parsing processes, all cores by default')
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        start = perf_counter()
+        statistics = ingest(path, args.column, int(args.chunk_mb * 1024 * 1024), jobs=args.jobs)
+        elapsed = perf_counter() - start
+        print(path)
+        for name, value in statistics.values().items():
+            print(f'  {name:<10}{"" if value is None else format_number(value)}')
+        print(f'{statistics.count:,} values in {elapsed:.2f} s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+import os
+import socket
+import getpass
+
+
+# the handoff runs before Qt and most of the standard library are imported, so this module stays lean
+handoff_timeout = 0.5
+ack = b'ok\n'
+
+# a request is the command and its arguments, NUL separated on one line
+command_show = 'show'
+
+
+def instance_path() -> str:
+    # per user, a Unix socket path on POSIX and a pipe name on Windows
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = str(os.getuid()) if hasattr(os, 'getuid') else 'user'
+    name = f'calculator-{user}'
+    if os.name == 'nt':
+        return name
+    # the directory Qt's temporary path resolves to as well
+    return os.path.join(os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp', name + '.sock')
+
+
+def encode_message(args: list[str]) -> bytes:
+    fields = [command_show, *(arg.replace('\n', ' ').replace('\0', '') for arg in args)]
+    return '\0'.join(fields).encode('utf-8', 'replace') + b'\n'
+
+
+def decode_message(line: bytes) -> tuple[str, list[str]]:
+    command, *args = line.rstrip(b'\n').decode('utf-8', 'replace').split('\0')
+    return command, args
+
+
+def hand_over(args: list[str], path: str | None = None) -> bool:
+    # True once a running calculator has acknowledged the request, anything else starts a new one
+    path = path or instance_path()
+    if os.name == 'nt':
+        return hand_over_qt(args, path)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(handoff_timeout)
+            connection.connect(path)
+            connection.sendall(encode_message(args))
+            return connection.recv(len(ack)) == ack
+    except OSError:
+        return False
+
+
+def hand_over_qt(args: list[str], path: str) -> bool:
+    # named pipes are not sockets, so Windows pays for QtNetwork
+    from PySide6.QtNetwork import QLocalSocket
+
+    timeout_ms = int(handoff_timeout * 1000)
+    connection = QLocalSocket()
+    connection.connectToServer(path)
+    if not connection.waitForConnected(timeout_ms):
+        return False
+    connection.write(encode_message(args))
+    if not connection.waitForBytesWritten(timeout_ms) or not connection.waitForReadyRead(timeout_ms):
+        return False
+    return bytes(connection.read(len(ack))) == ack
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from calc_instance import ack, command_show, decode_message, handoff_timeout
+
+
+max_message_bytes = 64 * 1024
+
+
+def probe(path: str) -> Optional[QLocalSocket.LocalSocketError]:
+    # None while a calculator is listening at path, a live one accepts even when its GUI thread is busy
+    connection = QLocalSocket()
+    connection.connectToServer(path)
+    if connection.waitForConnected(int(handoff_timeout * 1000)):
+        connection.abort()
+        return None
+    return connection.error()
+
+
+class InstanceServer(QObject):
+    # later launches connect here and ask the running calculator to show itself
+    activated = Signal(list)
+
+    def __init__(self, path: str, parent: Optional[QObject] = None):
+        super(InstanceServer, self).__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept)
+        # checked before listening, Qt renames its socket over the path and would orphan a live calculator,
+        # one started at the same moment or too busy to answer the handoff. this one then runs on its own
+        error = probe(path)
+        if error == QLocalSocket.ConnectionRefusedError:
+            # only a refused connection proves the socket was left by a calculator that is gone
+            QLocalServer.removeServer(path)
+        if error in (QLocalSocket.ConnectionRefusedError, QLocalSocket.ServerNotFoundError):
+            self.server.listen(path)
+
+    def is_listening(self) -> bool:
+        return self.server.isListening()
+
+    def accept(self) -> None:
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda connection=connection: self.read(connection))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def read(self, connection: QLocalSocket) -> None:
+        if not connection.canReadLine():
+            if connection.bytesAvailable() > max_message_bytes:
+                connection.abort()
+            return
+        command, args = decode_message(bytes(connection.readLine()))
+        if command != command_show:
+            connection.abort()
+            return
+        connection.write(ack)
+        connection.flush()
+        connection.disconnectFromServer()
+        self.activated.emit(args)
@@ -0,0 +1,102 @@
+import os
+import sys
+import mmap
+import shutil
+import argparse
+from time import perf_counter
+from typing import Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from calc_arithmetic import arithmetics
+from calc_stream import evaluate_lines
+
+
+default_chunk_bytes = 64 * 1024 * 1024
+
+
+def chunk_bounds(path: str, chunk_bytes: int = default_chunk_bytes, start: int = 0) -> list[tuple[int, int]]:
+    # every chunk ends just after a newline, or at the end of the file, the first one begins at start
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    bounds = []
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        while start < size:
+            end = data.find(b'\n', min(start + chunk_bytes, size) - 1)
+            end = size if end < 0 else end + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def chunk_lines(data: mmap.mmap, start: int, end: int, counted: list[int]) -> Iterator[str]:
+    # one line at a time out of the map, a chunk is never copied or decoded whole
+    data.seek(start)
+    readline = data.readline
+    while data.tell() < end:
+        counted[0] += 1
+        yield readline().decode('utf-8')
+
+
+def evaluate_chunk(path: str, start: int, end: int, part_path: str, arithmetic_name: str) -> tuple[int, int, float]:
+    begin = perf_counter()
+    arithmetic = arithmetics[arithmetic_name]()
+    lines = [0]
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+            open(part_path, 'w', encoding='utf-8') as target:
+        target.writelines(evaluate_lines(chunk_lines(data, start, end, lines), arithmetic))
+    return os.getpid(), lines[0], perf_counter() - begin
+
+
+def evaluate_file(path: str, output: str, arithmetic_name: str = 'float', jobs: Optional[int] = None,
+                  chunk_bytes: int = default_chunk_bytes) -> dict[int, tuple[int, float]]:
+    # returns lines and busy seconds per worker pid
+    bounds = chunk_bounds(path, chunk_bytes)
+    part_paths = [f'{output}.part{index:05d}' for index in range(len(bounds))]
+    workers: dict[int, tuple[int, float]] = {}
+
+    try:
+        with ProcessPoolExecutor(jobs) as executor:
+            futures = [executor.submit(evaluate_chunk, path, start, end, part_path, arithmetic_name)
+                       for (start, end), part_path in zip(bounds, part_paths)]
+            for future in as_completed(futures):
+                pid, lines, seconds = future.result()
+                total_lines, total_seconds = workers.get(pid, (0, 0.0))
+                workers[pid] = (total_lines + lines, total_seconds + seconds)
+
+        with open(output, 'wb') as target:
+            for part_path in part_paths:
+                with open(part_path, 'rb') as part:
+                    shutil.copyfileobj(part, target, 1024 * 1024)
+    finally:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+    return workers
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description='Evaluate a large file of "a op b" lines on all cores')
+    parser.add_argument('path')
+    parser.add_argument('output')
+    parser.add_argument('--arithmetic', choices=arithmetics, default='float')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes, all cores by default')
+    parser.add_argument('--chunk-mb', type=float, default=default_chunk_bytes / 1024 / 1024)
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    workers = evaluate_file(args.path, args.output, args.arithmetic, args.jobs, int(args.chunk_mb * 1024 * 1024))
+    elapsed = perf_counter() - start
+
+    total = sum(lines for lines, _ in workers.values())
+    for pid, (lines, seconds) in sorted(workers.items()):
+        print(f'worker {pid:>7}: {lines:>12,} lines {lines / seconds if seconds else 0:>12,.0f} lines/s',
+              file=sys.stderr)
+    print(f'total: {total:,} lines in {elapsed:.2f} s, {total / elapsed if elapsed else 0:,.0f} lines/s',
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
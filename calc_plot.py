@@ -0,0 +1,150 @@
+import math
+from typing import Callable, Optional
+
+import numpy as np
+
+from calc_batch import vector_power, vector_functions
+from calc_expr import Parser, ExpressionError, normalize, power_sign
+
+
+VectorEvaluator = Callable[[np.ndarray], np.ndarray]
+
+vector_signs: dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    '+': np.add,
+    '-': np.subtract,
+    'x': np.multiply,
+    '/': np.divide,
+    power_sign: lambda base, exponent: vector_power(base, exponent)[0],
+}
+
+# the x axis is split into tiles of this many pixels, sampled once per zoom level and reused while panning
+tile_pixels = 256
+initial_samples_per_pixel = 2
+
+# refinement halves the segments where the curve bends by more than the tolerance, in pixels
+bend_tolerance = 0.25
+max_refine_depth = 10
+max_tile_samples = 1 << 18
+
+# a step this tall between neighbouring samples is drawn as a gap, it is a pole rather than a curve
+jump_pixels = 4096
+
+
+def build(tree: tuple, variables: set) -> VectorEvaluator:
+    kind = tree[0]
+    if kind == 'number':
+        try:
+            value = float(tree[1])
+        except ValueError:
+            raise ExpressionError(f'invalid number {tree[1]!r}')
+        return lambda xs: np.full(1, value)
+
+    if kind == 'name':
+        variables.add(tree[1])
+        return lambda xs: xs
+
+    if kind == 'negate':
+        operand = build(tree[1], variables)
+        return lambda xs: np.negative(operand(xs))
+
+    if kind == 'call':
+        _, name, argument_tree = tree
+        if name not in vector_functions:
+            raise ExpressionError(f'unknown function {name!r}')
+        function, argument = vector_functions[name], build(argument_tree, variables)
+        return lambda xs: function(argument(xs))[0]
+
+    _, sign, left_tree, right_tree = tree
+    func, left, right = vector_signs[sign], build(left_tree, variables), build(right_tree, variables)
+    return lambda xs: func(*np.broadcast_arrays(left(xs), right(xs)))
+
+
+class PlotExpression:
+    # one free variable of any name is the abscissa, 'x' alone is taken by multiplication
+    def __init__(self, source: str):
+        self.source = normalize(source)
+        variables = set()
+        self.evaluate = build(Parser(self.source).parse(), variables)
+        if len(variables) > 1:
+            raise ExpressionError(f'more than one variable: {", ".join(sorted(variables))}')
+        self.variable: Optional[str] = next(iter(variables), None)
+
+    def __call__(self, xs: np.ndarray) -> np.ndarray:
+        # poles, domain errors and overflow are NaN, which the path draws as gaps
+        with np.errstate(all='ignore'):
+            ys = np.broadcast_to(self.evaluate(xs), xs.shape).astype(np.float64)
+        ys[~np.isfinite(ys)] = np.nan
+        return ys
+
+
+def zoom_level(units_per_pixel: float) -> int:
+    return math.floor(math.log2(units_per_pixel))
+
+
+def tile_span(level: int) -> float:
+    return tile_pixels * 2.0 ** level
+
+
+def bent_segments(xs: np.ndarray, ys: np.ndarray, x_pixel: float, y_pixel: float) -> np.ndarray:
+    u, v = xs / x_pixel, ys / y_pixel
+    # distance in pixels of each inner sample from the chord through its neighbours
+    chord = v[:-2] + (v[2:] - v[:-2]) * (u[1:-1] - u[:-2]) / (u[2:] - u[:-2])
+    with np.errstate(invalid='ignore'):
+        bent = np.abs(v[1:-1] - chord) > bend_tolerance
+    flags = np.zeros(len(xs) - 1, dtype=bool)
+    flags[:-1] |= bent
+    flags[1:] |= bent
+    # domain edges and poles are narrowed down as well
+    finite = np.isfinite(v)
+    flags |= finite[:-1] != finite[1:]
+    return np.flatnonzero(flags)
+
+
+def sample_tile(expression: PlotExpression, level: int, y_level: int, index: int) -> tuple[np.ndarray, np.ndarray]:
+    x_pixel, y_pixel = 2.0 ** level, 2.0 ** y_level
+    start = index * tile_span(level)
+    xs = start + np.arange(tile_pixels * initial_samples_per_pixel + 1) * (x_pixel / initial_samples_per_pixel)
+    ys = expression(xs)
+    # each pass evaluates the midpoints of every bent segment as one batch
+    for _ in range(max_refine_depth):
+        segments = bent_segments(xs, ys, x_pixel, y_pixel)
+        if not len(segments) or len(xs) + len(segments) > max_tile_samples:
+            break
+        middles = (xs[segments] + xs[segments + 1]) / 2
+        xs = np.insert(xs, segments + 1, middles)
+        ys = np.insert(ys, segments + 1, expression(middles))
+    return xs, ys
+
+
+def envelopes(xs: np.ndarray, ys: np.ndarray, level: int, y_level: int, index: int) -> list[np.ndarray]:
+    # one closed polygon per unbroken run: the highest sample of each pixel column out, the lowest back.
+    # filled, it covers a curve that swings within a column, stroking tall columns one by one is far slower
+    x_pixel, y_pixel = 2.0 ** level, 2.0 ** y_level
+    finite = np.isfinite(ys)
+    with np.errstate(invalid='ignore'):
+        breaks = ~finite[:-1] | ~finite[1:] | (np.abs(np.diff(ys)) > jump_pixels * y_pixel)
+    runs = np.concatenate([[0], np.cumsum(breaks)])
+    columns = np.clip(((xs - index * tile_span(level)) // x_pixel).astype(np.int64), 0, tile_pixels - 1)
+    keys = (runs * tile_pixels + columns)[finite]
+    xs, ys, runs = xs[finite], ys[finite], runs[finite]
+    if not len(xs):
+        return []
+
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    ends = np.concatenate([starts[1:], [len(keys)]]) - 1
+    middle = (xs[starts] + xs[ends]) / 2
+    high = np.maximum.reduceat(ys, starts)
+    low = np.minimum.reduceat(ys, starts)
+
+    group_runs = runs[starts]
+    polygons = []
+    for group in np.split(np.arange(len(starts)), np.flatnonzero(group_runs[1:] != group_runs[:-1]) + 1):
+        # the exact end samples keep neighbouring tiles joined
+        first, last = starts[group[0]], ends[group[-1]]
+        polygons.append(np.concatenate([
+            [[xs[first], ys[first]]],
+            np.column_stack([middle[group], high[group]]),
+            [[xs[last], ys[last]]],
+            np.column_stack([middle[group[::-1]], low[group[::-1]]]),
+        ]))
+    return polygons
@@ -0,0 +1,167 @@
+import math
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import (QPainter, QPainterPath, QPen, QColor, QTransform, QPolygonF,
+                           QPaintEvent, QWheelEvent, QMouseEvent)
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel
+
+from calc_expr import ExpressionError
+from calc_plot import PlotExpression, zoom_level, tile_span, sample_tile, envelopes
+
+
+default_units_per_pixel = 1 / 32
+wheel_zoom = 0.8
+
+axis_color = QColor('#555')
+curve_color = QColor('#4fc3f7')
+
+
+class PathCache:
+    # paths are in plot units, so panning only changes the painter transform
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.paths: OrderedDict[tuple, QPainterPath] = OrderedDict()
+        self.samples = 0
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, expression: PlotExpression, level: int, y_level: int, index: int) -> QPainterPath:
+        key = (expression.source, level, y_level, index)
+        path = self.paths.get(key)
+        if path is not None:
+            self.paths.move_to_end(key)
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        xs, ys = sample_tile(expression, level, y_level, index)
+        self.samples += len(xs)
+        path = QPainterPath()
+        for polygon in envelopes(xs, ys, level, y_level, index):
+            path.addPolygon(QPolygonF([QPointF(x, y) for x, y in polygon.tolist()]))
+            path.closeSubpath()
+        self.paths[key] = path
+        if len(self.paths) > self.max_entries:
+            self.paths.popitem(last=False)
+        return path
+
+
+class PlotCanvas(QWidget):
+    def __init__(self, parent: Optional[QWidget] = None):
+        super(PlotCanvas, self).__init__(parent)
+        self.setMinimumSize(200, 200)
+        self.expression: Optional[PlotExpression] = None
+        self.cache = PathCache()
+        self.center_x = 0.0
+        self.center_y = 0.0
+        self.units_per_pixel = default_units_per_pixel
+        self.drag_start: Optional[QPointF] = None
+
+    def set_expression(self, expression: Optional[PlotExpression]) -> None:
+        self.expression = expression
+        self.update()
+
+    def reset_view(self) -> None:
+        self.center_x = self.center_y = 0.0
+        self.units_per_pixel = default_units_per_pixel
+        self.update()
+
+    def to_plot(self, point: QPointF) -> tuple[float, float]:
+        return (self.center_x + (point.x() - self.width() / 2) * self.units_per_pixel,
+                self.center_y - (point.y() - self.height() / 2) * self.units_per_pixel)
+
+    def plot_transform(self) -> QTransform:
+        scale = 1 / self.units_per_pixel
+        return QTransform(scale, 0, 0, -scale,
+                          self.width() / 2 - self.center_x * scale, self.height() / 2 + self.center_y * scale)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+
+        transform = self.plot_transform()
+        origin = transform.map(QPointF(0, 0))
+        painter.setPen(axis_color)
+        painter.drawLine(QPointF(0, origin.y()), QPointF(self.width(), origin.y()))
+        painter.drawLine(QPointF(origin.x(), 0), QPointF(origin.x(), self.height()))
+
+        if self.expression is None:
+            return
+        # both axes share a zoom level, the tiles of the level cover the visible x range
+        level = zoom_level(self.units_per_pixel)
+        left, _ = self.to_plot(QPointF(0, 0))
+        right, _ = self.to_plot(QPointF(self.width(), 0))
+        span = tile_span(level)
+
+        # a one pixel cosmetic pen skips the stroker, wider pens cost tens of times more per segment
+        pen = QPen(curve_color, 1)
+        pen.setCosmetic(True)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(pen)
+        painter.setBrush(curve_color)
+        painter.setTransform(transform)
+        for index in range(math.floor(left / span), math.floor(right / span) + 1):
+            painter.drawPath(self.cache.path(self.expression, level, level, index))
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        # the point under the cursor stays put
+        anchor_x, anchor_y = self.to_plot(event.position())
+        self.units_per_pixel *= wheel_zoom ** (event.angleDelta().y() / 120)
+        new_x, new_y = self.to_plot(event.position())
+        self.center_x += anchor_x - new_x
+        self.center_y += anchor_y - new_y
+        self.update()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.LeftButton:
+            self.drag_start = event.position()
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        if self.drag_start is None:
+            return
+        delta = event.position() - self.drag_start
+        self.drag_start = event.position()
+        self.center_x -= delta.x() * self.units_per_pixel
+        self.center_y += delta.y() * self.units_per_pixel
+        self.update()
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        self.drag_start = None
+
+    def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
+        self.reset_view()
+
+
+class PlotView(QWidget):
+    def __init__(self, parent: Optional[QWidget] = None):
+        super(PlotView, self).__init__(parent)
+
+        self.le_expression = QLineEdit(self)
+        self.le_expression.setPlaceholderText('f(t), e.g. sin(t x 30) / t')
+        self.le_expression.editingFinished.connect(self.plot)
+
+        self.lbl_status = QLabel(self)
+        self.lbl_status.setStyleSheet('color: #888;')
+
+        self.canvas = PlotCanvas(self)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.le_expression)
+        layout.addWidget(self.canvas, 1)
+        layout.addWidget(self.lbl_status)
+
+    def plot(self) -> None:
+        source = self.le_expression.text().strip()
+        if not source:
+            self.lbl_status.setText('')
+            self.canvas.set_expression(None)
+            return
+        try:
+            expression = PlotExpression(source)
+        except ExpressionError as error:
+            self.lbl_status.setText(str(error))
+            return
+        self.lbl_status.setText('')
+        self.canvas.set_expression(expression)
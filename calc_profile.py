@@ -0,0 +1,92 @@
+import json
+import atexit
+from types import MethodType
+from time import perf_counter_ns
+from typing import Callable, Iterable
+
+
+sub_bucket_bits = 3
+
+
+class LatencyHistogram:
+    # log-linear buckets: exact below 16 ns, then 8 buckets per power of two
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        bits = value.bit_length()
+        if bits <= sub_bucket_bits + 1:
+            index = value
+        else:
+            shift = bits - sub_bucket_bits - 1
+            index = (shift << sub_bucket_bits) + (value >> shift)
+
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @staticmethod
+    def bucket_value(index: int) -> int:
+        if index < 2 << sub_bucket_bits:
+            return index
+        shift = (index >> sub_bucket_bits) - 1
+        return (index - (shift << sub_bucket_bits)) << shift
+
+    def percentile(self, fraction: float) -> int:
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return self.bucket_value(index)
+        return self.max
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total_ms': self.total / 1e6,
+            'mean_us': self.total / self.count / 1e3,
+            'p50_us': self.percentile(0.5) / 1e3,
+            'p90_us': self.percentile(0.9) / 1e3,
+            'p99_us': self.percentile(0.99) / 1e3,
+            'max_us': self.max / 1e3,
+        }
+
+
+def timed(func: Callable, histogram: LatencyHistogram) -> Callable:
+    def wrapper(self, *args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            histogram.record(perf_counter_ns() - start)
+
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+class SlotProfiler:
+    def __init__(self, path: str):
+        self.path = path
+        self.histograms: dict[str, LatencyHistogram] = {}
+        atexit.register(self.dump)
+
+    def instrument(self, obj: object, method_names: Iterable[str]) -> None:
+        # bound to the instance so Qt still sees a method of the receiver and sender() works
+        for name in method_names:
+            histogram = self.histograms.setdefault(name, LatencyHistogram())
+            setattr(obj, name, MethodType(timed(getattr(type(obj), name), histogram), obj))
+
+    def report(self) -> dict[str, dict]:
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def dump(self) -> None:
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=2)
@@ -0,0 +1,93 @@
+from typing import Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFontDatabase, QResizeEvent, QShowEvent
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSizePolicy
+
+from calc_arithmetic import Number
+from calc_radix import RadixViews, radix_names, compact_text
+
+
+min_view_chars = 8
+
+
+class ProgrammerPanel(QWidget):
+    # every base is shown at once, conversions run only while the panel is visible
+    def __init__(self, buttons: dict[str, str], parent: Optional[QWidget] = None):
+        super(ProgrammerPanel, self).__init__(parent)
+        self.setObjectName('programmer_panel')
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)
+
+        self.views = RadixViews()
+        self.value: Optional[Number] = None
+        self.converted = False
+        self.view_chars = min_view_chars
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        fixed_font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        self.base_buttons: dict[int, QPushButton] = {}
+        for base in radix_names:
+            btn = QPushButton(self)
+            btn.setObjectName(f'btn_base_{base}')
+            btn.setFlat(True)
+            btn.setFont(fixed_font)
+            btn.setStyleSheet('text-align: left; padding: 2px 4px;')
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setToolTip('Click to copy')
+            btn.clicked.connect(self.copy_view)
+            layout.addWidget(btn)
+            self.base_buttons[base] = btn
+
+        row = QHBoxLayout()
+        row.setSpacing(0)
+        self.buttons: dict[str, QPushButton] = {}
+        for btn_name, text in buttons.items():
+            btn = QPushButton(text, self)
+            btn.setObjectName(btn_name)
+            btn.setCursor(Qt.PointingHandCursor)
+            row.addWidget(btn)
+            self.buttons[btn_name] = btn
+        layout.addLayout(row)
+
+    def set_value(self, value: Optional[Number]) -> None:
+        if value is self.value and self.converted:
+            return
+        self.value = value
+        self.converted = False
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self) -> None:
+        if self.value is None:
+            self.views.value = None
+        else:
+            self.views.set_value(self.value)
+        for base, btn in self.base_buttons.items():
+            text = self.views.view(base)
+            btn.setText(f'{radix_names[base]}  {"" if text is None else compact_text(text, self.view_chars)}')
+        self.converted = True
+
+    def copy_view(self) -> None:
+        base = next(base for base, btn in self.base_buttons.items() if btn is self.sender())
+        text = self.views.view(base)
+        if text is not None:
+            QApplication.clipboard().setText(text)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super(ProgrammerPanel, self).showEvent(event)
+        if not self.converted:
+            self.refresh()
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super(ProgrammerPanel, self).resizeEvent(event)
+        btn = next(iter(self.base_buttons.values()))
+        metrics = btn.fontMetrics()
+        # the base name, two spaces and the button padding take the rest of the row
+        view_chars = max((event.size().width() - 8) // metrics.horizontalAdvance('0') - 5, min_view_chars)
+        if view_chars != self.view_chars:
+            self.view_chars = view_chars
+            if self.converted:
+                self.refresh()
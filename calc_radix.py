@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from typing import Optional
+
+from calc_arithmetic import Number, as_integer
+from calc_bigint import int_to_str
+
+
+# power-of-two bases are linear with format(), base 10 goes through the divide-and-conquer conversion
+radix_formats = {16: 'X', 8: 'o', 2: 'b'}
+radix_names = {16: 'HEX', 10: 'DEC', 8: 'OCT', 2: 'BIN'}
+
+
+def to_base(value: int, base: int) -> str:
+    if base == 10:
+        return int_to_str(value)
+    text = format(abs(value), radix_formats[base])
+    return '-' + text if value < 0 else text
+
+
+def compact_text(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    head = (max_chars - 1) // 2
+    return text[:head] + '…' + text[len(text) - (max_chars - 1 - head):]
+
+
+class RadixViews:
+    def __init__(self, max_values: int = 8):
+        # a few recent values stay converted, so undo and redo do not redo the conversions
+        self.max_values = max_values
+        self.values: OrderedDict[int, dict[int, str]] = OrderedDict()
+        self.value: Optional[int] = None
+        self.conversions = 0
+
+    def set_value(self, value: Number) -> None:
+        # non-integers have no radix views
+        try:
+            self.value = as_integer(value)
+        except ValueError:
+            self.value = None
+            return
+        if self.value in self.values:
+            self.values.move_to_end(self.value)
+        else:
+            self.values[self.value] = {}
+            while len(self.values) > self.max_values:
+                self.values.popitem(last=False)
+
+    def view(self, base: int) -> Optional[str]:
+        # only the views that are asked for get converted
+        if self.value is None:
+            return None
+        views = self.values[self.value]
+        text = views.get(base)
+        if text is None:
+            text = views[base] = to_base(self.value, base)
+            self.conversions += 1
+        return text
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.value = None
@@ -0,0 +1,152 @@
+import os
+import sys
+import struct
+import argparse
+from array import array
+from time import perf_counter_ns
+from typing import BinaryIO, Iterator
+
+# recorded and replayed sessions stay out of the user's calculation history, main reads this on import
+os.environ.setdefault('CALC_HISTORY', '')
+
+from PySide6.QtWidgets import QApplication
+
+from main import Calculator, button_slots
+
+
+record_magic = b'CALCREC1'
+
+# slots that open a dialog would stop a replay until someone answers it, they are neither recorded nor replayed
+interactive_slots = ('load_statistics',)
+replayable_slots = {btn_name: slot_name for btn_name, slot_name in button_slots.items()
+                    if slot_name not in interactive_slots}
+
+slot_names = tuple(dict.fromkeys(replayable_slots.values()))
+button_names = tuple(replayable_slots)
+
+
+class SessionRecorder:
+    def __init__(self, window):
+        self.window = window
+        self.events = array('B')
+
+        for btn_name, slot_name in replayable_slots.items():
+            btn = getattr(window.ui, btn_name)
+            event = (slot_names.index(slot_name), button_names.index(btn_name))
+            btn.clicked.connect(lambda checked=False, event=event: self.events.extend(event))
+
+    def __len__(self) -> int:
+        return len(self.events) // 2
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            write_session(file, self.events)
+
+
+def write_session(file: BinaryIO, events: array) -> None:
+    file.write(record_magic)
+    for names in (slot_names, button_names):
+        file.write(struct.pack('<B', len(names)))
+        for name in names:
+            encoded = name.encode()
+            file.write(struct.pack('<B', len(encoded)) + encoded)
+    file.write(struct.pack('<I', len(events) // 2))
+    events.tofile(file)
+
+
+def read_session(path: str) -> Iterator[tuple[str, str]]:
+    with open(path, 'rb') as file:
+        if file.read(len(record_magic)) != record_magic:
+            raise ValueError(f'{path} is not a calculator session record')
+
+        tables = []
+        for _ in range(2):
+            names = []
+            for _ in range(file.read(1)[0]):
+                names.append(file.read(file.read(1)[0]).decode())
+            tables.append(names)
+        slots, buttons = tables
+
+        count, = struct.unpack('<I', file.read(4))
+        events = array('B')
+        events.fromfile(file, count * 2)
+
+    for i in range(0, len(events), 2):
+        yield slots[events[i]], buttons[events[i + 1]]
+
+
+def percentile(values: list[int], fraction: float) -> int:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def replay(window, events: list[tuple[str, str]], repeat: int = 1) -> dict[str, dict]:
+    latencies: dict[str, list[int]] = {slot_name: [] for slot_name in slot_names}
+    buttons = {btn_name: getattr(window.ui, btn_name) for btn_name in button_names}
+
+    for _ in range(repeat):
+        for slot_name, btn_name in events:
+            if slot_name in interactive_slots:
+                continue
+            if button_slots.get(btn_name) != slot_name:
+                raise ValueError(f'{btn_name} is not connected to {slot_name}')
+
+            btn = buttons[btn_name]
+            start = perf_counter_ns()
+            btn.click()
+            latencies[slot_name].append(perf_counter_ns() - start)
+
+    report = {}
+    for slot_name, values in latencies.items():
+        if not values:
+            continue
+        values.sort()
+        total = sum(values)
+        report[slot_name] = {
+            'count': len(values),
+            'per_second': len(values) / (total / 1e9) if total else 0.0,
+            'p50_us': percentile(values, 0.5) / 1000,
+            'p99_us': percentile(values, 0.99) / 1000,
+        }
+    return report
+
+
+def print_report(report: dict[str, dict]) -> None:
+    print(f'{"slot":<16}{"count":>10}{"keys/s":>12}{"p50 us":>10}{"p99 us":>10}')
+    for slot_name, stats in report.items():
+        print(f'{slot_name:<16}{stats["count"]:>10}{stats["per_second"]:>12.0f}'
+              f'{stats["p50_us"]:>10.1f}{stats["p99_us"]:>10.1f}')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Record and replay calculator sessions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record')
+    record_parser.add_argument('path')
+
+    replay_parser = subparsers.add_parser('replay')
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--repeat', type=int, default=1)
+
+    args = parser.parse_args()
+
+    if args.command == 'replay':
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    app = QApplication(sys.argv[:1])
+    window = Calculator()
+    window.show()
+
+    if args.command == 'record':
+        recorder = SessionRecorder(window)
+        status = app.exec()
+        recorder.save(args.path)
+        print(f'{len(recorder)} events recorded to {args.path}')
+        return status
+
+    print_report(replay(window, list(read_session(args.path)), args.repeat))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
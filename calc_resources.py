@@ -0,0 +1,17 @@
+import os
+
+from PySide6.QtCore import QResource
+
+
+icons_rcc = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calc_icons.rcc')
+icons_loaded = False
+
+
+def load_icons() -> None:
+    # Qt memory-maps the .rcc file, the embedded calc_icons module is only a fallback
+    global icons_loaded
+    if icons_loaded:
+        return
+    if not QResource.registerResource(icons_rcc):
+        import calc_icons
+    icons_loaded = True
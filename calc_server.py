@@ -0,0 +1,277 @@
+import sys
+import json
+import asyncio
+import argparse
+from time import perf_counter_ns
+from typing import Optional
+
+import numpy as np
+
+from calc_arithmetic import Number, FloatArithmetic, arithmetics
+from calc_batch import status_ok, status_messages, operator_codes, evaluate_batch
+from calc_cache import ResultCache
+from calc_engine import error_syntax, error_domain, domain_errors, default_entry_max_len, zero_division_error
+from calc_format import NumberFormatter
+from calc_profile import LatencyHistogram
+from calc_stream import operator_aliases
+
+
+default_host = '127.0.0.1'
+default_port = 8765
+default_max_batch = 4096
+default_max_in_flight = 256
+
+# scalar requests run on the event loop, one costing more than this would stall every connection
+default_max_cost = 10 ** 9
+error_too_costly = 'Calculation too large'
+
+# float64 holds every int up to here exactly, so vectorized results match Python's
+exact_int_limit = 2 ** 53
+
+# ^ and root go through math.pow one by one, numpy's power may differ from it in the last bit
+vector_signs = ('+', '-', 'x', '/')
+
+
+def vectorizable(value: Number) -> bool:
+    return type(value) is float or (type(value) is int and -exact_int_limit < value < exact_int_limit)
+
+
+class BatchEvaluator:
+    # requests arriving within one event loop iteration are evaluated together
+    def __init__(self, arithmetic: FloatArithmetic, max_batch: int = default_max_batch,
+                 max_cost: Optional[int] = default_max_cost):
+        self.arithmetic = arithmetic
+        self.max_batch = max_batch
+        self.max_cost = max_cost
+        self.formatter = NumberFormatter(default_entry_max_len)
+        self.cache = ResultCache()
+        self.pending: list[tuple[str, Number, Number, asyncio.Future]] = []
+        self.scheduled = False
+        self.batches = 0
+        self.batched = 0
+
+    def submit(self, sign: str, left: Number, right: Number) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((sign, left, right, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif not self.scheduled:
+            self.scheduled = True
+            loop.call_soon(self.flush)
+        return future
+
+    def flush(self) -> None:
+        self.scheduled = False
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.batched += len(pending)
+
+        results = self.evaluate([(sign, left, right) for sign, left, right, _ in pending])
+        for (_, _, _, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    def evaluate(self, calls: list[tuple[str, Number, Number]]) -> list[tuple[str, str]]:
+        # each answer is ('result', text) or ('error', message)
+        results: list[Optional[tuple[str, str]]] = [None] * len(calls)
+        if type(self.arithmetic) is FloatArithmetic:
+            rows = [row for row, (sign, left, right) in enumerate(calls)
+                    if sign in vector_signs and vectorizable(left) and vectorizable(right)]
+            if rows:
+                self.evaluate_vector(calls, rows, results)
+
+        for row, result in enumerate(results):
+            if result is None:
+                results[row] = self.evaluate_scalar(*calls[row])
+        return results
+
+    def evaluate_vector(self, calls: list[tuple[str, Number, Number]], rows: list[int],
+                        results: list[Optional[tuple[str, str]]]) -> None:
+        left = np.fromiter((calls[row][1] for row in rows), dtype=np.float64, count=len(rows))
+        right = np.fromiter((calls[row][2] for row in rows), dtype=np.float64, count=len(rows))
+        codes = np.fromiter((operator_codes[calls[row][0]] for row in rows), dtype=np.uint8, count=len(rows))
+        # overflow gives inf as it does for Python floats, so numpy need not warn
+        with np.errstate(over='ignore', invalid='ignore'):
+            values, status = evaluate_batch(left, right, codes)
+
+        for row, value, code in zip(rows, values.tolist(), status.tolist()):
+            if code != status_ok:
+                results[row] = 'error', status_messages[code]
+                continue
+            sign, lhs, rhs = calls[row]
+            if sign != '/' and type(lhs) is int and type(rhs) is int:
+                # int results stay int in the engine, the float copy is only good while it is exact
+                if -exact_int_limit < value < exact_int_limit:
+                    results[row] = 'result', self.formatter.format(int(value))
+            else:
+                results[row] = 'result', self.formatter.format(value)
+
+    def evaluate_scalar(self, sign: str, left: Number, right: Number) -> tuple[str, str]:
+        if self.max_cost is not None and self.arithmetic.cost(sign, left, right) > self.max_cost:
+            return 'error', error_too_costly
+        try:
+            value = self.cache.call(sign, self.arithmetic.operations[sign], left, right)
+        except ZeroDivisionError:
+            return 'error', zero_division_error(sign, left)
+        except domain_errors:
+            return 'error', error_domain
+        return 'result', self.formatter.format(value)
+
+
+class ConnectionStats:
+    def __init__(self, peer: str):
+        self.peer = peer
+        self.requests = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.stalls = 0
+        self.latency = LatencyHistogram()
+
+    def summary(self) -> dict:
+        return {
+            'peer': self.peer,
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'stalls': self.stalls,
+            'latency': self.latency.summary(),
+        }
+
+
+class CalculationServer:
+    def __init__(self, arithmetic: FloatArithmetic, max_batch: int = default_max_batch,
+                 max_in_flight: int = default_max_in_flight, quiet: bool = False,
+                 max_cost: Optional[int] = default_max_cost):
+        self.arithmetic = arithmetic
+        self.evaluator = BatchEvaluator(arithmetic, max_batch, max_cost)
+        self.max_in_flight = max_in_flight
+        self.quiet = quiet
+
+    def parse_request(self, request: dict) -> tuple[str, Number, Number]:
+        sign = request['operator']
+        sign = operator_aliases.get(sign, sign)
+        if sign not in self.arithmetic.operations:
+            raise ValueError(sign)
+        return sign, self.arithmetic.parse(str(request['left'])), self.arithmetic.parse(str(request['right']))
+
+    def answer(self, line: bytes) -> tuple[object, asyncio.Future]:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            future.set_result(('error', error_syntax))
+            return None, future
+
+        request_id = request.get('id')
+        if request.get('stats'):
+            future.set_result(('stats', None))
+            return request_id, future
+
+        try:
+            sign, left, right = self.parse_request(request)
+        except (KeyError, ValueError, ArithmeticError):
+            future.set_result(('error', error_syntax))
+            return request_id, future
+        return request_id, self.evaluator.submit(sign, left, right)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info('peername') or 'unix'
+        stats = ConnectionStats(str(peer))
+        # bounds the answers owed to a client that is not reading them
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        answers: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self.send_answers(answers, in_flight, writer, stats))
+
+        try:
+            while True:
+                if in_flight.locked():
+                    stats.stalls += 1
+                await in_flight.acquire()
+                line = await reader.readline()
+                if not line:
+                    in_flight.release()
+                    break
+                stats.bytes_in += len(line)
+                if not line.strip():
+                    in_flight.release()
+                    continue
+                request_id, future = self.answer(line)
+                answers.put_nowait((request_id, perf_counter_ns(), future))
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            answers.put_nowait(None)
+            await sender
+            writer.close()
+            if not self.quiet:
+                print(json.dumps(stats.summary()), file=sys.stderr)
+
+    async def send_answers(self, answers: asyncio.Queue, in_flight: asyncio.Semaphore,
+                           writer: asyncio.StreamWriter, stats: ConnectionStats) -> None:
+        while True:
+            item = await answers.get()
+            if item is None:
+                return
+            request_id, start, future = item
+            kind, text = await future
+            if kind == 'stats':
+                text = stats.summary()
+            else:
+                stats.requests += 1
+                stats.latency.record(perf_counter_ns() - start)
+                if kind == 'error':
+                    stats.errors += 1
+
+            data = json.dumps({'id': request_id, kind: text}).encode() + b'\n'
+            stats.bytes_out += len(data)
+            writer.write(data)
+            in_flight.release()
+            if answers.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    return
+
+    async def serve(self, host: str = default_host, port: int = default_port,
+                    unix_path: Optional[str] = None) -> None:
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        if not self.quiet:
+            print(f'listening on {unix_path or f"{host}:{port}"}', file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description='Serve "a op b" calculations as JSON lines')
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    parser.add_argument('--host', default=default_host)
+    parser.add_argument('--port', type=int, default=default_port)
+    parser.add_argument('--arithmetic', choices=arithmetics, default='float')
+    parser.add_argument('--max-batch', type=int, default=default_max_batch)
+    parser.add_argument('--max-in-flight', type=int, default=default_max_in_flight)
+    parser.add_argument('--max-cost', type=int, default=default_max_cost,
+                        help='operand bit-size product above which a request is refused')
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    server = CalculationServer(arithmetics[args.arithmetic](), args.max_batch, args.max_in_flight, args.quiet,
+                               args.max_cost)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,95 @@
+import math
+from decimal import Decimal
+from typing import Optional
+
+from calc_arithmetic import Number, FloatArithmetic
+
+
+def divide(arithmetic: Optional[FloatArithmetic], left: Number, right: Number) -> Number:
+    # through the backend, so int entries give a Fraction or Decimal mean rather than a float
+    if arithmetic is None:
+        return left / right
+    return arithmetic.operations['/'](left, right)
+
+
+class Statistics:
+    # immutable, so undo snapshots share it until the next value is added
+    __slots__ = ('count', 'mean', 'm2', 'total', 'minimum', 'maximum')
+
+    def __init__(self, count: int = 0, mean: Number = 0, m2: Number = 0, total: Number = 0,
+                 minimum: Optional[Number] = None, maximum: Optional[Number] = None):
+        set_field = object.__setattr__
+        set_field(self, 'count', count)
+        set_field(self, 'mean', mean)
+        set_field(self, 'm2', m2)
+        set_field(self, 'total', total)
+        set_field(self, 'minimum', minimum)
+        set_field(self, 'maximum', maximum)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        # chunk results come back from worker processes
+        return type(self), (self.count, self.mean, self.m2, self.total, self.minimum, self.maximum)
+
+    def added(self, value: Number, arithmetic: Optional[FloatArithmetic] = None) -> 'Statistics':
+        # Welford's update, the mean and squared deviations stay accurate for values far from zero
+        if type(self.mean) is float and isinstance(value, Decimal):
+            value = float(value)
+        count = self.count + 1
+        delta = value - self.mean
+        mean = self.mean + divide(arithmetic, delta, count)
+        return Statistics(count, mean, self.m2 + delta * (value - mean), self.total + value,
+                          value if self.minimum is None else min(self.minimum, value),
+                          value if self.maximum is None else max(self.maximum, value))
+
+    def merged(self, other: 'Statistics', arithmetic: Optional[FloatArithmetic] = None) -> 'Statistics':
+        # Chan's pairwise combination, used to fold in the per-chunk results
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        this = self.as_float() if type(other.mean) is float else self
+        count = this.count + other.count
+        delta = other.mean - this.mean
+        return Statistics(count, this.mean + divide(arithmetic, delta * other.count, count),
+                          this.m2 + other.m2 + divide(arithmetic, delta * delta * this.count * other.count, count),
+                          this.total + other.total,
+                          min(this.minimum, other.minimum), max(this.maximum, other.maximum))
+
+    def as_float(self) -> 'Statistics':
+        if not self.count:
+            return self
+        return Statistics(self.count, float(self.mean), float(self.m2), float(self.total),
+                          float(self.minimum), float(self.maximum))
+
+    @property
+    def average(self) -> Optional[Number]:
+        return self.mean if self.count else None
+
+    def variance(self, arithmetic: Optional[FloatArithmetic] = None) -> Optional[Number]:
+        # sample variance, as on the s key of a scientific calculator
+        if self.count < 2:
+            return None
+        return divide(arithmetic, self.m2, self.count - 1)
+
+    def std_dev(self, arithmetic: Optional[FloatArithmetic] = None) -> Optional[Number]:
+        variance = self.variance(arithmetic)
+        if variance is None:
+            return None
+        if isinstance(variance, Decimal):
+            return variance.sqrt()
+        std_dev = math.sqrt(variance)
+        return std_dev if arithmetic is None else arithmetic.coerce(std_dev)
+
+    def values(self, arithmetic: Optional[FloatArithmetic] = None) -> dict[str, Optional[Number]]:
+        return {
+            'count': self.count,
+            'sum': self.total if self.count else None,
+            'mean': self.average,
+            'variance': self.variance(arithmetic),
+            'std_dev': self.std_dev(arithmetic),
+            'min': self.minimum,
+            'max': self.maximum,
+        }
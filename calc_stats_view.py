@@ -0,0 +1,130 @@
+import os
+import threading
+from typing import Optional
+
+from PySide6.QtCore import Qt, QObject, Signal
+from PySide6.QtGui import QShowEvent
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLabel, QSizePolicy
+
+from calc_arithmetic import FloatArithmetic
+from calc_format import NumberFormatter
+from calc_stats import Statistics
+
+
+# statistic -> (label, row, column)
+statistic_rows = {
+    'count': ('n', 0, 0),
+    'sum': ('Σx', 0, 1),
+    'mean': ('x̄', 1, 0),
+    'std_dev': ('s', 1, 1),
+    'min': ('min', 2, 0),
+    'max': ('max', 2, 1),
+    'variance': ('s²', 3, 0),
+}
+
+stat_max_length = 12
+
+
+class StatisticsLoader(QObject):
+    # parsing runs off the GUI thread, NumPy releases the GIL for most of it
+    finished = Signal(object)
+    failed = Signal(object)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super(StatisticsLoader, self).__init__(parent)
+        self.loading = False
+
+    def load(self, path: str) -> None:
+        self.loading = True
+        threading.Thread(target=self.run, args=(path,), daemon=True).start()
+
+    def run(self, path: str) -> None:
+        try:
+            # imported here, NumPy is not needed until the first file is loaded
+            from calc_ingest import ingest
+
+            statistics = ingest(path)
+        except Exception as error:
+            self.loading = False
+            self.failed.emit(error)
+        else:
+            self.loading = False
+            self.finished.emit(statistics)
+
+
+class StatisticsPanel(QWidget):
+    recalled = Signal(str)
+
+    def __init__(self, buttons: dict[str, str], parent: Optional[QWidget] = None):
+        super(StatisticsPanel, self).__init__(parent)
+        self.setObjectName('statistics_panel')
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)
+
+        self.formatter = NumberFormatter(stat_max_length)
+        self.statistics: Optional[Statistics] = None
+        self.arithmetic: Optional[FloatArithmetic] = None
+        self.shown: Optional[Statistics] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        grid = QGridLayout()
+        grid.setSpacing(0)
+        self.stat_buttons: dict[str, QPushButton] = {}
+        for name, (text, row, column) in statistic_rows.items():
+            btn = QPushButton(self)
+            btn.setObjectName(f'btn_stat_{name}')
+            btn.setFlat(True)
+            btn.setStyleSheet('text-align: left; padding: 2px 4px;')
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setToolTip('Click to use as the entry')
+            btn.clicked.connect(self.recall)
+            grid.addWidget(btn, row, column)
+            self.stat_buttons[name] = btn
+        layout.addLayout(grid)
+
+        self.lbl_status = QLabel(self)
+        self.lbl_status.setStyleSheet('color: #888;')
+        self.lbl_status.hide()
+        layout.addWidget(self.lbl_status)
+
+        row = QHBoxLayout()
+        row.setSpacing(0)
+        self.buttons: dict[str, QPushButton] = {}
+        for btn_name, text in buttons.items():
+            btn = QPushButton(text, self)
+            btn.setObjectName(btn_name)
+            btn.setCursor(Qt.PointingHandCursor)
+            row.addWidget(btn)
+            self.buttons[btn_name] = btn
+        layout.addLayout(row)
+
+    def set_statistics(self, statistics: Statistics, arithmetic: Optional[FloatArithmetic] = None) -> None:
+        # shown as the engine recalls them, in its backend's numbers
+        self.statistics = statistics
+        self.arithmetic = arithmetic
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self) -> None:
+        if self.statistics is None or self.statistics is self.shown:
+            return
+        for name, value in self.statistics.values(self.arithmetic).items():
+            text = '' if value is None else self.formatter.format(value)
+            self.stat_buttons[name].setText(f'{statistic_rows[name][0]}  {text}')
+        self.shown = self.statistics
+
+    def recall(self) -> None:
+        self.recalled.emit(self.sender().objectName().removeprefix('btn_stat_'))
+
+    def show_status(self, text: str) -> None:
+        self.lbl_status.setText(text)
+        self.lbl_status.setVisible(bool(text))
+
+    def loading(self, path: str) -> None:
+        self.show_status(f'Loading {os.path.basename(path)}…')
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super(StatisticsPanel, self).showEvent(event)
+        self.refresh()
@@ -0,0 +1,64 @@
+import sys
+import argparse
+from typing import Iterable, Iterator, TextIO
+
+from calc_arithmetic import FloatArithmetic, arithmetics
+from calc_engine import error_syntax, error_domain, domain_errors, zero_division_error
+from calc_format import format_number
+
+
+operator_aliases = {'*': 'x', '**': '^'}
+
+
+def evaluate_line(line: str, arithmetic: FloatArithmetic) -> str:
+    parts = line.split()
+    if len(parts) != 3:
+        return error_syntax
+
+    left, sign, right = parts
+    sign = operator_aliases.get(sign, sign)
+    func = arithmetic.operations.get(sign)
+    if func is None:
+        return error_syntax
+
+    try:
+        left, right = arithmetic.parse(left), arithmetic.parse(right)
+    except (ValueError, ArithmeticError):
+        return error_syntax
+
+    try:
+        return format_number(func(left, right))
+    except ZeroDivisionError:
+        return zero_division_error(sign, left)
+    except domain_errors:
+        return error_domain
+
+
+def evaluate_lines(lines: Iterable[str], arithmetic: FloatArithmetic) -> Iterator[str]:
+    for line in lines:
+        if line.strip():
+            yield evaluate_line(line, arithmetic) + '\n'
+
+
+def evaluate_stream(source: TextIO, target: TextIO, arithmetic: FloatArithmetic) -> None:
+    target.writelines(evaluate_lines(source, arithmetic))
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description='Evaluate "a op b" lines from files or stdin')
+    parser.add_argument('paths', nargs='*', default=['-'])
+    parser.add_argument('--arithmetic', choices=arithmetics, default='float')
+    args = parser.parse_args(argv)
+
+    arithmetic = arithmetics[args.arithmetic]()
+    for path in args.paths:
+        if path == '-':
+            evaluate_stream(sys.stdin, sys.stdout, arithmetic)
+        else:
+            with open(path, encoding='utf-8') as source:
+                evaluate_stream(source, sys.stdout, arithmetic)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,87 @@
+from collections import deque
+from typing import Optional
+
+from calc_arithmetic import Number
+from calc_stats import Statistics
+
+
+default_undo_limit = 10_000
+
+
+class Pending:
+    # everything apart from the entry, shared by all snapshots taken while it is unchanged
+    __slots__ = ('temp', 'temp_str', 'operator', 'last_operator', 'right_str', 'result', 'statistics')
+
+    def __init__(self, temp: Optional[Number], temp_str: str, operator: Optional[str],
+                 last_operator: Optional[str], right_str: str, result: Optional[Number],
+                 statistics: Statistics):
+        set_field = object.__setattr__
+        set_field(self, 'temp', temp)
+        set_field(self, 'temp_str', temp_str)
+        set_field(self, 'operator', operator)
+        set_field(self, 'last_operator', last_operator)
+        set_field(self, 'right_str', right_str)
+        set_field(self, 'result', result)
+        set_field(self, 'statistics', statistics)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def matches(self, temp: Optional[Number], temp_str: str, operator: Optional[str],
+                last_operator: Optional[str], right_str: str, result: Optional[Number],
+                statistics: Statistics) -> bool:
+        return (self.temp_str == temp_str and self.operator == operator and self.right_str == right_str
+                and self.last_operator == last_operator and self.temp is temp and self.result is result
+                and self.statistics is statistics)
+
+
+class Snapshot:
+    __slots__ = ('entry', 'entry_value', 'error', 'pending')
+
+    def __init__(self, entry: str, entry_value: Optional[Number], error: Optional[str], pending: Pending):
+        set_field = object.__setattr__
+        set_field(self, 'entry', entry)
+        set_field(self, 'entry_value', entry_value)
+        set_field(self, 'error', error)
+        set_field(self, 'pending', pending)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def same_state(self, other: 'Snapshot') -> bool:
+        return self.entry == other.entry and self.error == other.error and self.pending is other.pending
+
+
+class UndoStack:
+    def __init__(self, limit: Optional[int] = default_undo_limit):
+        # a full deque drops its oldest snapshot on append, None keeps every state
+        self.undo_states: deque[Snapshot] = deque(maxlen=limit)
+        self.redo_states: list[Snapshot] = []
+        self.current: Optional[Snapshot] = None
+
+    def record(self, snapshot: Snapshot) -> None:
+        if self.current is not None:
+            if snapshot.same_state(self.current):
+                return
+            self.undo_states.append(self.current)
+            self.redo_states.clear()
+        self.current = snapshot
+
+    def undo(self) -> Optional[Snapshot]:
+        if not self.undo_states:
+            return None
+        self.redo_states.append(self.current)
+        self.current = self.undo_states.pop()
+        return self.current
+
+    def redo(self) -> Optional[Snapshot]:
+        if not self.redo_states:
+            return None
+        self.undo_states.append(self.current)
+        self.current = self.redo_states.pop()
+        return self.current
+
+    def clear(self) -> None:
+        self.undo_states.clear()
+        self.redo_states.clear()
+        self.current = None
@@ -0,0 +1,97 @@
+import threading
+from typing import Optional, TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Signal
+
+from calc_arithmetic import Number, FloatArithmetic
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+
+# operand bit-size product above which a calculation leaves the GUI thread
+default_cost_threshold = 10 ** 9
+
+
+def serve(connection: 'Connection') -> None:
+    while True:
+        try:
+            job_id, arithmetic, sign, left, right = connection.recv()
+        except EOFError:
+            return
+        try:
+            connection.send((job_id, True, arithmetic.operations[sign](left, right)))
+        except Exception as error:
+            connection.send((job_id, False, error))
+
+
+class CalculationWorker(QObject):
+    # big int arithmetic holds the GIL, so the work runs in a separate process
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+
+    def __init__(self, cost_threshold: int = default_cost_threshold, parent: Optional[QObject] = None):
+        super(CalculationWorker, self).__init__(parent)
+        self.cost_threshold = cost_threshold
+        self.process: Optional['BaseProcess'] = None
+        self.connection: Optional['Connection'] = None
+        self.job_id = 0
+        self.pending: Optional[int] = None
+
+    def should_offload(self, arithmetic: FloatArithmetic, sign: str, left: Number, right: Number) -> bool:
+        return arithmetic.cost(sign, left, right) > self.cost_threshold
+
+    def submit(self, arithmetic: FloatArithmetic, sign: str, left: Number, right: Number) -> int:
+        self.cancel()
+        if self.process is not None and not self.process.is_alive():
+            self.shutdown()
+        if self.process is None:
+            # imported here, multiprocessing is a noticeable part of startup
+            import multiprocessing
+
+            context = multiprocessing.get_context('spawn')
+            self.connection, child_connection = context.Pipe()
+            self.process = context.Process(target=serve, args=(child_connection,), daemon=True)
+            self.process.start()
+            child_connection.close()
+
+        self.job_id += 1
+        self.pending = self.job_id
+        self.connection.send((self.job_id, arithmetic, sign, left, right))
+        threading.Thread(target=self.wait_result, args=(self.connection, self.job_id), daemon=True).start()
+        return self.job_id
+
+    def wait_result(self, connection: 'Connection', job_id: int) -> None:
+        try:
+            job_id, ok, value = connection.recv()
+        except (EOFError, OSError):
+            # the process is gone, killed for running out of memory as a rule. a cancelled job is
+            # ignored by is_current, so only a calculation still waited for reports it
+            self.failed.emit(job_id, MemoryError('the calculation process stopped'))
+            return
+        if ok:
+            self.finished.emit(job_id, value)
+        else:
+            self.failed.emit(job_id, value)
+
+    def is_current(self, job_id: int) -> bool:
+        if job_id != self.pending:
+            return False
+        self.pending = None
+        return True
+
+    def cancel(self) -> None:
+        # a running computation cannot be interrupted, so the process is replaced
+        if self.pending is None:
+            return
+        self.pending = None
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.connection.close()
+            self.process = None
+            self.connection = None
@@ -1,257 +1,525 @@
+import os
 import sys
-from typing import Union, Optional
-from operator import add, sub, mul, truediv
 
-from PySide6.QtWidgets import QApplication, QMainWindow
-from PySide6.QtGui import QFontDatabase
+# CALC_SINGLE_INSTANCE=0 starts a separate calculator on every launch
+single_instance = os.environ.get('CALC_SINGLE_INSTANCE', '1') != '0'
 
-from calc_design import Ui_MainWindow
+if __name__ == '__main__' and single_instance:
+    # a later launch only wakes the running calculator, before paying for the imports below
+    from calc_instance import hand_over
 
+    if hand_over(sys.argv[1:]):
+        sys.exit(0)
 
-operations = {
-    '+': add,
-    '-': sub,
-    'x': mul,
-    '/': truediv
-}
+import argparse
+from typing import Optional
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QPushButton, QSizePolicy, QFileDialog,
+                               QDockWidget, QSystemTrayIcon, QMenu)
+from PySide6.QtGui import QFontDatabase, QResizeEvent, QKeySequence, QShortcut
+
+from calc_design import Ui_MainWindow
+from calc_fitting import FontFitter
+from calc_profile import SlotProfiler
+from calc_worker import CalculationWorker
+from calc_arithmetic import Number, FloatArithmetic, arithmetics
+from calc_bigint import digit_count
+from calc_cache import ResultCache
+from calc_history import History
+from calc_programmer_view import ProgrammerPanel
+from calc_stats import Statistics
+from calc_stats_view import StatisticsPanel, StatisticsLoader
+from calc_engine import CalculatorEngine
 
-error_zero_div = 'Division by zero'
-error_undefined = 'Result is undefined'
 
 default_font_size = 16
 default_entry_font_size = 40
 
+busy_text = 'Calculating...'
+
+# preview updates are coalesced to at most one per frame
+preview_interval_ms = 16
+
+# buttons added to the designer grid in code: name -> (text, row, column)
+scientific_buttons = {
+    'btn_sin': ('sin', 0, 0),
+    'btn_cos': ('cos', 0, 1),
+    'btn_tan': ('tan', 0, 2),
+    'btn_ln': ('ln', 0, 6),
+    'btn_log': ('log', 1, 0),
+    'btn_exp': ('eˣ', 1, 1),
+    'btn_sqr': ('x²', 1, 2),
+    'btn_sqrt': ('√x', 1, 6),
+    'btn_power': ('xʸ', 2, 7),
+    'btn_root': ('ʸ√x', 3, 7),
+    'btn_reciprocal': ('1/x', 4, 7),
+    'btn_percent': ('%', 5, 7),
+    'btn_exp10': ('10ˣ', 6, 7),
+}
+
+function_buttons = {
+    'btn_sin': 'sin',
+    'btn_cos': 'cos',
+    'btn_tan': 'tan',
+    'btn_ln': 'ln',
+    'btn_log': 'log',
+    'btn_exp': 'exp',
+    'btn_sqr': 'sqr',
+    'btn_sqrt': 'sqrt',
+    'btn_reciprocal': 'reciprocal',
+    'btn_exp10': 'exp10',
+    'btn_not': 'not',
+}
+
+# bitwise buttons live in the programmer panel: name -> text
+programmer_buttons = {
+    'btn_and': 'AND',
+    'btn_or': 'OR',
+    'btn_xor': 'XOR',
+    'btn_shl': '<<',
+    'btn_shr': '>>',
+    'btn_not': 'NOT',
+}
+
+# buttons under the statistics panel: name -> text
+statistics_buttons = {
+    'btn_stat_add': 'Σ+',
+    'btn_stat_clear': 'CS',
+    'btn_stat_load': 'Load…',
+}
+
+operator_buttons = {
+    'btn_power': '^',
+    'btn_root': 'root',
+    'btn_and': 'and',
+    'btn_or': 'or',
+    'btn_xor': 'xor',
+    'btn_shl': '<<',
+    'btn_shr': '>>',
+}
+
+scientific_min_size = (375, 600)
+
+digit_buttons = ('btn_0', 'btn_1', 'btn_2', 'btn_3', 'btn_4',
+                 'btn_5', 'btn_6', 'btn_7', 'btn_8', 'btn_9')
+
+button_slots = {
+    # digits
+    **{btn_name: 'add_digit' for btn_name in digit_buttons},
+
+    # actions
+    'btn_c': 'clear_all',
+    'btn_ce': 'clear_entry',
+    'btn_dot': 'add_point',
+    'btn_neg': 'negate',
+    'btn_backspace': 'backspace',
+
+    # math
+    'btn_equal': 'calculate',
+    'btn_add': 'math_operation',
+    'btn_sub': 'math_operation',
+    'btn_mul': 'math_operation',
+    'btn_div': 'math_operation',
+
+    # scientific
+    **{btn_name: 'apply_function' for btn_name in function_buttons},
+    **{btn_name: 'math_operation' for btn_name in operator_buttons},
+    'btn_percent': 'percent',
+
+    # statistics
+    'btn_stat_add': 'add_statistic',
+    'btn_stat_clear': 'clear_statistics',
+    'btn_stat_load': 'load_statistics',
+}
+
+error_disabled_buttons = ('btn_c', 'btn_add', 'btn_sub', 'btn_mul', 'btn_div', 'btn_neg', 'btn_dot',
+                          *function_buttons, *operator_buttons, 'btn_percent', 'btn_stat_add')
+
+profiled_methods = (*dict.fromkeys(button_slots.values()),
+                    'undo', 'redo', 'recall_statistic', 'render', 'update_preview', 'adjust_entry_font_size', 'disable_buttons')
+
+# set CALC_PROFILE to a json path to collect per-slot latency histograms
+profile_path = os.environ.get('CALC_PROFILE')
+profile_hotkey = 'Ctrl+Shift+P'
+
+# float, decimal or fraction
+arithmetic_name = os.environ.get('CALC_ARITHMETIC', 'float')
+
+# completed calculations are appended here, an empty CALC_HISTORY turns the tape off
+history_path = os.environ.get('CALC_HISTORY', os.path.join(os.path.expanduser('~'), '.calculator_history'))
+history_hotkey = 'Ctrl+H'
+
+programmer_hotkey = 'Ctrl+M'
+statistics_hotkey = 'Ctrl+T'
+plot_hotkey = 'Ctrl+G'
+
+# csv files give their first column, .bin/.f64 are raw float64 and .npy keeps its own header
+statistics_file_filter = 'Data files (*.csv *.txt *.npy *.bin *.f64);;All files (*)'
+
+
+def open_history(path: str) -> Optional[History]:
+    # a foreign or unwritable file turns the tape off, the calculator still starts
+    try:
+        return History(path)
+    except (OSError, ValueError) as error:
+        print(f'calculation history is off: {error}', file=sys.stderr)
+        return None
+
+
 class Calculator(QMainWindow):
     def __init__(self):
         super(Calculator, self).__init__()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
 
+        self.add_scientific_buttons()
+
         self.le_entry = self.ui.lineEdit
         self.lbl_temp = self.ui.label
         self.entry_max_len = self.le_entry.maxLength()
 
+        self.history = open_history(history_path) if history_path else None
+        self.history_view = None
+        self.plot_dock: Optional[QDockWidget] = None
+        self.engine = CalculatorEngine(self.entry_max_len, arithmetics[arithmetic_name](), ResultCache(), self.history)
+        self.rendered_entry = self.le_entry.text()
+        self.rendered_temp = self.lbl_temp.text()
+        self.rendered_error: Optional[str] = None
+
+        self.worker = CalculationWorker(parent=self)
+        self.worker.finished.connect(self.calculation_finished)
+        self.worker.failed.connect(self.calculation_failed)
+        self.engine.offload = self.offload_calculation
+
+        self.lbl_preview = QLabel(self.ui.centralwidget)
+        self.lbl_preview.setObjectName('lbl_preview')
+        self.lbl_preview.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)
+        self.lbl_preview.setStyleSheet('color: #888;')
+        self.lbl_preview.setAlignment(Qt.AlignRight | Qt.AlignTrailing | Qt.AlignVCenter)
+        self.ui.verticalLayout.insertWidget(self.ui.verticalLayout.indexOf(self.le_entry) + 1, self.lbl_preview)
+
+        self.programmer_panel = ProgrammerPanel(programmer_buttons, self.ui.centralwidget)
+        self.programmer_panel.hide()
+        for btn_name, btn in self.programmer_panel.buttons.items():
+            setattr(self.ui, btn_name, btn)
+        self.ui.verticalLayout.insertWidget(self.ui.verticalLayout.indexOf(self.lbl_preview) + 1,
+                                            self.programmer_panel)
+
+        self.statistics_panel = StatisticsPanel(statistics_buttons, self.ui.centralwidget)
+        self.statistics_panel.hide()
+        self.statistics_panel.recalled.connect(self.recall_statistic)
+        for btn_name, btn in self.statistics_panel.buttons.items():
+            setattr(self.ui, btn_name, btn)
+        self.ui.verticalLayout.insertWidget(self.ui.verticalLayout.indexOf(self.programmer_panel) + 1,
+                                            self.statistics_panel)
+
+        self.programmer_panel.set_value(self.programmer_value())
+        self.statistics_panel.set_statistics(self.engine.statistics, self.engine.arithmetic)
+
+        self.statistics_loader = StatisticsLoader(self)
+        self.statistics_loader.finished.connect(self.statistics_loaded)
+        self.statistics_loader.failed.connect(self.statistics_failed)
+
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(preview_interval_ms)
+        self.preview_timer.timeout.connect(self.update_preview)
+
+        self.font_fitter: Optional[FontFitter] = None
+        self.entry_font_size = default_entry_font_size
+
         QFontDatabase.addApplicationFont("fonts/Rubik-Regular.ttf")
 
-        # digits
-        self.ui.btn_0.clicked.connect(self.add_digit)
-        self.ui.btn_1.clicked.connect(self.add_digit)
-        self.ui.btn_2.clicked.connect(self.add_digit)
-        self.ui.btn_3.clicked.connect(self.add_digit)
-        self.ui.btn_4.clicked.connect(self.add_digit)
-        self.ui.btn_5.clicked.connect(self.add_digit)
-        self.ui.btn_6.clicked.connect(self.add_digit)
-        self.ui.btn_7.clicked.connect(self.add_digit)
-        self.ui.btn_8.clicked.connect(self.add_digit)
-        self.ui.btn_9.clicked.connect(self.add_digit)
-
-        # actions
-        self.ui.btn_c.clicked.connect(self.clear_all)
-        self.ui.btn_ce.clicked.connect(self.clear_entry)
-        self.ui.btn_dot.clicked.connect(self.add_point)
-        self.ui.btn_neg.clicked.connect(self.negate)
-        self.ui.btn_backspace.clicked.connect(self.backspace)
-
-
-        #math
-        self.ui.btn_equal.clicked.connect(self.calculate)
-        self.ui.btn_add.clicked.connect(self.math_operation)
-        self.ui.btn_sub.clicked.connect(self.math_operation)
-        self.ui.btn_mul.clicked.connect(self.math_operation)
-        self.ui.btn_div.clicked.connect(self.math_operation)
-
-    def add_digit(self):
-        self.remove_error()
+        self.profiler: Optional[SlotProfiler] = None
+        if profile_path:
+            self.profiler = SlotProfiler(profile_path)
+            self.profiler.instrument(self, profiled_methods)
+            QShortcut(QKeySequence(profile_hotkey), self, self.profiler.dump)
+
+        QShortcut(QKeySequence.Paste, self, self.paste_expression)
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+        if self.history is not None:
+            QShortcut(QKeySequence(history_hotkey), self, self.toggle_history)
+        QShortcut(QKeySequence(programmer_hotkey), self, self.toggle_programmer)
+        QShortcut(QKeySequence(statistics_hotkey), self, self.toggle_statistics)
+        QShortcut(QKeySequence(plot_hotkey), self, self.toggle_plot)
+
+        for btn_name, slot_name in button_slots.items():
+            getattr(self.ui, btn_name).clicked.connect(getattr(self, slot_name))
+
+    def add_scientific_buttons(self) -> None:
+        size_policy = self.ui.btn_c.sizePolicy()
+        for btn_name, (text, row, column) in scientific_buttons.items():
+            btn = QPushButton(text, self.ui.centralwidget)
+            btn.setObjectName(btn_name)
+            btn.setSizePolicy(size_policy)
+            btn.setCursor(Qt.PointingHandCursor)
+            self.ui.gridLayout.addWidget(btn, row, column, 1, 1)
+            setattr(self.ui, btn_name, btn)
+        self.setMinimumSize(*scientific_min_size)
+
+    def add_digit(self) -> None:
         btn = self.sender()
-        digit_buttons = ('btn_0', 'btn_1', 'btn_2', 'btn_3', 'btn_4',
-                         'btn_5', 'btn_6', 'btn_7', 'btn_8', 'btn_9')
         if btn.objectName() in digit_buttons:
-            if self.le_entry.text() == '0':
-                self.le_entry.setText(btn.text())
-            else:
-                self.le_entry.setText(self.le_entry.text() + btn.text())
-        self.adjust_entry_font_size()
+            self.engine.add_digit(btn.text())
+        self.render()
 
     def clear_all(self) -> None:
-        self.remove_error()
-        self.le_entry.setText('0')
-        self.lbl_temp.clear()
-        self.adjust_entry_font_size()
+        self.worker.cancel()
+        self.engine.clear_all()
+        self.render()
 
     def clear_entry(self) -> None:
-        self.remove_error()
-        self.le_entry.setText('0')
-        self.adjust_entry_font_size()
+        self.worker.cancel()
+        self.engine.clear_entry()
+        self.render()
 
     def add_point(self) -> None:
-        if '.' not in self.le_entry.text():
-            self.le_entry.setText(self.le_entry.text() + '.')
-            self.adjust_entry_font_size()
+        self.engine.add_point()
+        self.render()
 
     def negate(self) -> None:
-        entry = self.le_entry.text()
-        if '-' not in entry:
-            if entry != '0':
-                entry = '-' + entry
-        else:
-            entry = entry[1:]
-
-        if len(entry) == self.entry_max_len + 1 and '-' in entry:
-            self.le_entry.setMaxLength(self.entry_max_len + 1)
-        else:
-            self.le_entry.setMaxLength(self.entry_max_len)
-
-        self.le_entry.setText(entry)
-        self.adjust_entry_font_size()
+        self.engine.negate()
+        self.render()
 
     def backspace(self) -> None:
-        self.remove_error()
-        entry = self.le_entry.text()
-
-        if len(entry) != 1:
-            if len(entry) == 2 and '-' in entry:
-                self.le_entry.setText('0')
-            else:
-                self.le_entry.setText(entry[:-1])
-        else:
-            self.le_entry.setText('0')
-        self.adjust_entry_font_size()
-
-    def add_temp(self) -> None:
-        btn = self.sender()
-        entry = self.remove_trailing_zeros(self.le_entry.text())
-
-        if not self.lbl_temp.text() or self.get_math_sign() == '=':
-            self.lbl_temp.setText(entry + f' {btn.text()} ')
-            self.le_entry.setText('0')
-            self.adjust_entry_font_size()
-
-    @staticmethod
-    def remove_trailing_zeros(num: str) -> str:
-        n = str(float(num))
-        return n[:-2] if n[-2:] == '.0' else n
-
-    def get_entry_num(self) -> int | float:
-        entry = self.le_entry.text().strip('.')
-        return float(entry) if '.' in entry else int(entry)
-
-    def get_temp_num(self) -> Union[int, float, None]:
-        if self.lbl_temp.text():
-            temp = self.lbl_temp.text().strip('.').split()[0]
-            return float(temp) if '.' in temp else int(temp)
-
-    def get_math_sign(self) -> Optional[str]:
-        if self.lbl_temp.text():
-            return self.lbl_temp.text().strip('.').split()[-1]
+        self.engine.backspace()
+        self.render()
 
     def calculate(self) -> Optional[str]:
-        entry = self.le_entry.text()
-        temp = self.lbl_temp.text()
-
-        if temp:
-            try:
-                result = self.remove_trailing_zeros(
-                    str(operations[self.get_math_sign()](self.get_temp_num(), self.get_entry_num())))
-                self.lbl_temp.setText(temp + self.remove_trailing_zeros(entry) + ' =')
-                self.adjust_entry_font_size()
-                self.le_entry.setText(result)
-                self.adjust_entry_font_size()
-                return result
-            except KeyError:
-                pass
-
-            except ZeroDivisionError:
-                if self.get_temp_num() == 0:
-                    self.show_error(error_undefined)
-                else:
-                    self.show_error(error_zero_div)
+        result = self.engine.calculate()
+        self.render()
+        return result
 
     def math_operation(self) -> None:
-        temp = self.lbl_temp.text()
         btn = self.sender()
-
-        if not temp:
-            self.add_temp()
-        else:
-            if self.get_math_sign() != btn.text():
-                if self.get_math_sign() == '=':
-                    self.add_temp()
-                else:
-                    self.lbl_temp.setText(temp[:-2] + f'{btn.text()} ')
-            else:
-                try:
-                    self.lbl_temp.setText(self.calculate() + f' {btn.text()}')
-                except TypeError:
-                    pass
-
-    def clear_temp_if_equality(self) -> None:
-        if self.get_math_sign() == '=':
-            self.lbl_temp.clear()
-
-    def show_error(self, text: str) -> None:
-        self.le_entry.setMaxLength(len(text))
-        self.le_entry.setText(text)
-        self.adjust_entry_font_size()
-        self.disable_buttons(True)
-
-    def remove_error(self) -> None:
-        if self.le_entry.text() in (error_undefined, error_zero_div):
-            self.le_entry.setMaxLength(self.entry_max_len)
-            self.le_entry.setText('0')
+        self.engine.math_operation(operator_buttons.get(btn.objectName(), btn.text()))
+        self.render()
+
+    def apply_function(self) -> None:
+        self.engine.apply_function(function_buttons[self.sender().objectName()])
+        self.render()
+
+    def percent(self) -> None:
+        self.engine.percent()
+        self.render()
+
+    def paste_expression(self) -> None:
+        self.engine.enter_expression(QApplication.clipboard().text())
+        self.render()
+
+    def undo(self) -> None:
+        self.engine.undo()
+        self.render()
+
+    def redo(self) -> None:
+        self.engine.redo()
+        self.render()
+
+    def toggle_history(self) -> None:
+        if self.history_view is None:
+            # imported here, the view is not needed until the tape is first opened
+            from calc_history_view import HistoryView
+
+            self.history_view = HistoryView(self.history, self)
+        self.history_view.setVisible(not self.history_view.isVisible())
+
+    def add_statistic(self) -> None:
+        self.engine.add_statistic()
+        self.render()
+
+    def clear_statistics(self) -> None:
+        self.engine.clear_statistics()
+        self.render()
+
+    def recall_statistic(self, name: str) -> None:
+        self.engine.recall_statistic(name)
+        self.render()
+
+    def load_statistics(self) -> None:
+        if self.statistics_loader.loading:
+            return
+        path, _ = QFileDialog.getOpenFileName(self, 'Add values from file', '', statistics_file_filter)
+        if path:
+            self.statistics_panel.loading(path)
+            self.statistics_loader.load(path)
+
+    def statistics_loaded(self, statistics: Statistics) -> None:
+        self.statistics_panel.show_status('')
+        self.engine.merge_statistics(statistics)
+        self.render()
+
+    def statistics_failed(self, error: Exception) -> None:
+        self.statistics_panel.show_status(f'Could not load: {error}')
+
+    def activate(self, args: Optional[list[str]] = None) -> None:
+        # shown again for a later launch or the tray icon, wherever it was left
+        self.setWindowState(self.windowState() & ~Qt.WindowMinimized)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def toggle_plot(self) -> None:
+        if self.plot_dock is None:
+            # imported here, the plot pulls in NumPy
+            from calc_plot_view import PlotView
+
+            self.plot_dock = QDockWidget('Plot', self)
+            self.plot_dock.setObjectName('plot_dock')
+            self.plot_dock.setWidget(PlotView(self.plot_dock))
+            self.addDockWidget(Qt.RightDockWidgetArea, self.plot_dock)
+            return
+        self.plot_dock.setVisible(not self.plot_dock.isVisible())
+
+    def toggle_programmer(self) -> None:
+        self.toggle_panel(self.programmer_panel)
+
+    def toggle_statistics(self) -> None:
+        self.toggle_panel(self.statistics_panel)
+
+    def toggle_panel(self, panel: QWidget) -> None:
+        if panel.isVisible():
+            panel.hide()
+            return
+        panel.show()
+        # grow the window by the panel height instead of squeezing the keypad
+        self.resize(self.width(), max(self.height(), self.sizeHint().height()))
+
+    def programmer_value(self) -> Optional[Number]:
+        engine = self.engine
+        if engine.busy or engine.error is not None:
+            return None
+        return engine.entry_number()
+
+    def offload_calculation(self, arithmetic: FloatArithmetic, sign: str, left: Number, right: Number) -> bool:
+        if not self.worker.should_offload(arithmetic, sign, left, right):
+            return False
+        self.worker.submit(arithmetic, sign, left, right)
+        return True
+
+    def calculation_finished(self, job_id: int, value: Number) -> None:
+        if self.worker.is_current(job_id):
+            self.engine.finish_calculation(value)
+            self.render()
+
+    def calculation_failed(self, job_id: int, error: Exception) -> None:
+        if self.worker.is_current(job_id):
+            try:
+                self.engine.fail_calculation(error)
+            finally:
+                self.render()
+
+    def render(self) -> None:
+        engine = self.engine
+
+        if engine.error != self.rendered_error:
+            self.disable_buttons(engine.error is not None)
+            self.rendered_error = engine.error
+
+        changed = False
+        entry = busy_text if engine.busy else engine.entry
+        if entry != self.rendered_entry:
+            self.le_entry.setMaxLength(max(engine.entry_limit, len(entry)))
+            self.le_entry.setText(entry)
+            self.le_entry.setToolTip(self.entry_tooltip(entry))
+            self.rendered_entry = entry
             self.adjust_entry_font_size()
-            self.disable_buttons(False)
+            changed = True
+            # hidden panels only keep the value, they convert it once shown
+            self.programmer_panel.set_value(self.programmer_value())
+
+        temp_text = engine.temp_text
+        if temp_text != self.rendered_temp:
+            self.lbl_temp.setText(temp_text)
+            self.rendered_temp = temp_text
+            changed = True
+
+        if engine.statistics is not self.statistics_panel.statistics:
+            self.statistics_panel.set_statistics(engine.statistics, engine.arithmetic)
+
+        if self.history_view is not None:
+            self.history_view.model.sync()
+
+        if changed and not self.preview_timer.isActive():
+            self.preview_timer.start()
+
+    def entry_tooltip(self, entry: str) -> str:
+        # a head...tail entry hides the magnitude, so the digit count goes in the tooltip
+        value = self.engine.entry_value
+        if '…' not in entry or type(value) is not int:
+            return ''
+        return f'{digit_count(value):,} digits'
+
+    def update_preview(self) -> None:
+        value = self.engine.preview(self.worker.cost_threshold)
+        text = '' if value is None else '= ' + self.engine.formatter.format(value)
+        if text != self.lbl_preview.text():
+            self.lbl_preview.setText(text)
 
     def disable_buttons(self, disable: bool) -> None:
-        self.ui.btn_c.setDisabled(disable)
-        self.ui.btn_add.setDisabled(disable)
-        self.ui.btn_sub.setDisabled(disable)
-        self.ui.btn_mul.setDisabled(disable)
-        self.ui.btn_div.setDisabled(disable)
-        self.ui.btn_neg.setDisabled(disable)
-        self.ui.btn_dot.setDisabled(disable)
-
-        color = 'color: #888;' if disable else 'color: white;'
-        self.change_buttons_color(color)
-
-    def change_buttons_color(self, css_color: str) -> None:
-        self.ui.btn_c.setStyleSheet(css_color)
-        self.ui.btn_add.setStyleSheet(css_color)
-        self.ui.btn_sub.setStyleSheet(css_color)
-        self.ui.btn_mul.setStyleSheet(css_color)
-        self.ui.btn_div.setStyleSheet(css_color)
-        self.ui.btn_neg.setStyleSheet(css_color)
-        self.ui.btn_dot.setStyleSheet(css_color)
-
-    def get_entry_text_width(self) -> int:
-        return self.le_entry.fontMetrics().boundingRect(
-            self.le_entry.text()).width()
-
-    def get_temp_text_width(self) -> int:
-        return self.lbl_temp.fontMetrics().boundingRect(
-            self.lbl_temp.text()).width()
+        # greying out comes from the QPushButton:disabled rule, so no per-button restyling
+        self.ui.centralwidget.setUpdatesEnabled(False)
+        for btn_name in error_disabled_buttons:
+            getattr(self.ui, btn_name).setDisabled(disable)
+        self.ui.centralwidget.setUpdatesEnabled(True)
 
     def adjust_entry_font_size(self) -> None:
-        font_size = default_entry_font_size
-
-        while self.get_entry_text_width() > self.le_entry.width() - 15:
-            font_size -= 1
+        if self.font_fitter is None:
+            self.le_entry.ensurePolished()
+            self.font_fitter = FontFitter(self.le_entry.font(), max_size=default_entry_font_size)
 
+        font_size = self.font_fitter.fit(self.le_entry.text(), self.le_entry.width())
+        if font_size != self.entry_font_size:
+            self.entry_font_size = font_size
             self.le_entry.setStyleSheet('font-size: ' + str(font_size) + 'pt; border: none;')
-        font_size = 1
-        while self.get_entry_text_width() < self.le_entry.width() - 60:
-            font_size += 1
 
-            if font_size > default_entry_font_size:
-                break
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super(Calculator, self).resizeEvent(event)
+        self.adjust_entry_font_size()
+
 
-            self.le_entry.setStyleSheet(
-                'font-size: ' + str(font_size) + 'pt; border: none;')
+def add_tray_icon(app: QApplication, window: Calculator) -> Optional[QSystemTrayIcon]:
+    # with a tray icon, closing the window keeps the process warm for the next launch
+    if not QSystemTrayIcon.isSystemTrayAvailable():
+        return None
+    tray = QSystemTrayIcon(window.windowIcon(), app)
+    tray.setToolTip('Calculator')
+    menu = QMenu(window)
+    menu.addAction('Show', window.activate)
+    menu.addAction('Quit', app.quit)
+    tray.setContextMenu(menu)
+    tray.activated.connect(lambda reason: window.activate() if reason == QSystemTrayIcon.Trigger else None)
+    tray.show()
+    app.setQuitOnLastWindowClosed(False)
+    return tray
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='Calculator')
+    parser.add_argument('--tray', action='store_true', help='stay in the tray when the window is closed')
+    parser.add_argument('--background', action='store_true',
+                        help='start warm in the tray without a window, the next launch shows it')
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
 
     window = Calculator()
-    window.show()
+    if single_instance:
+        from calc_instance import instance_path
+        from calc_instance_server import InstanceServer
+
+        instance_server = InstanceServer(instance_path(), app)
+        instance_server.activated.connect(window.activate)
+        app.aboutToQuit.connect(instance_server.server.close)
+
+    tray = add_tray_icon(app, window) if args.tray or args.background else None
+    if args.background:
+        # styles and layouts are resolved now rather than on the first show
+        window.ensurePolished()
+        window.layout().activate()
+    else:
+        window.show()
 
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# the calc_* modules sit at the top of the repository, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def app():
+    # one application per process, a gui one since font metrics need it
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
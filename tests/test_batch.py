@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from calc_batch import (evaluate_batch, encode_operators, evaluate_function_batch, status_ok, status_zero_div,
+                        status_undefined, status_invalid_operator, status_domain)
+
+
+def evaluate(left, right, signs):
+    return evaluate_batch(np.asarray(left), np.asarray(right), encode_operators(signs))
+
+
+def test_mixed_operators():
+    values, status = evaluate([1, 6, 2, 9, 8], [2, 3, 10, 3, 3], ['+', 'x', '^', '/', 'root'])
+    np.testing.assert_allclose(values, [3, 18, 1024, 3, 2])
+    assert (status == status_ok).all()
+
+
+def test_division_statuses():
+    values, status = evaluate([1, 0, 4], [0, 0, 2], ['/', '/', '/'])
+    assert status.tolist() == [status_zero_div, status_undefined, status_ok]
+    assert np.isnan(values[:2]).all() and values[2] == 2
+
+
+def test_int64_operands_do_not_wrap():
+    values, status = evaluate([2 ** 62, 2 ** 62, -2 ** 62], [4, 2 ** 62, 2 ** 62], ['x', '+', '-'])
+    assert values.tolist() == [2.0 ** 64, 2.0 ** 63, -2.0 ** 63]
+    assert (status == status_ok).all()
+
+
+def test_unknown_operator():
+    _, status = evaluate([1], [1], ['%'])
+    assert status[0] == status_invalid_operator
+
+
+def test_bitwise():
+    values, status = evaluate([6, 6, 6, 1, 64, 1.5], [3, 3, 3, 4, 2, 1], ['and', 'or', 'xor', '<<', '>>', 'and'])
+    assert values[:5].tolist() == [2, 7, 5, 16, 16]
+    assert status.tolist() == [status_ok] * 5 + [status_domain]
+
+
+@pytest.mark.parametrize('name, values, expected', [
+    ('sin', [0, 30, 90, 180], [0, 0.5, 1, 0]),
+    ('sqrt', [4, 2.25], [2, 1.5]),
+    ('reciprocal', [4], [0.25]),
+])
+def test_functions(name, values, expected):
+    results, status = evaluate_function_batch(name, values)
+    np.testing.assert_allclose(results, expected)
+    assert (status == status_ok).all()
+
+
+def test_function_domain():
+    _, status = evaluate_function_batch('ln', [0, -1, 1])
+    assert status.tolist() == [status_domain, status_domain, status_ok]
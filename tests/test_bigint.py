@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from calc_bigint import (int_to_str, str_to_int, leading_digits, compact_int, digit_count, power_of_ten,
+                         decimal_power_of_two, power_cache_size, small_int_bits, small_str_digits)
+from calc_format import NumberFormatter
+from calc_radix import to_base, compact_text, RadixViews
+
+
+# sizes on both sides of the thresholds where the divide-and-conquer conversions take over,
+# all below the 4300 digits str() accepts
+bit_sizes = [1, 64, small_int_bits, small_int_bits + 1, 14_000]
+
+
+@pytest.mark.parametrize('bits', bit_sizes)
+@pytest.mark.parametrize('sign', [1, -1])
+def test_int_to_str_matches_str(bits, sign):
+    value = sign * (random.Random(bits).getrandbits(bits) | 1)
+    assert int_to_str(value) == str(value)
+    assert str_to_int(str(value)) == value
+
+
+def test_power_caches_are_bounded():
+    for bits in range(small_int_bits, 40 * small_int_bits, small_int_bits // 2 + 1):
+        int_to_str(random.Random(bits).getrandbits(bits))
+        str_to_int('7' * (bits // 3))
+    assert decimal_power_of_two.cache_info().currsize <= power_cache_size
+    assert power_of_ten.cache_info().currsize <= power_cache_size
+
+
+def test_decimal_round_trip_past_the_str_limit():
+    value = -random.Random(0).getrandbits(100_000)
+    assert str_to_int(int_to_str(value)) == value
+
+
+@pytest.mark.parametrize('digits', [1, small_str_digits, small_str_digits + 1, 4_000])
+def test_str_to_int_matches_int(digits):
+    text = ''.join(random.Random(digits).choice('0123456789') for _ in range(digits))
+    assert str_to_int(text) == int(text)
+    assert str_to_int('-' + text) == -int(text)
+
+
+@pytest.mark.parametrize('text', ['12a', '--1', '1 2', '٣' * (small_str_digits + 1), '1' * small_str_digits + 'x'])
+def test_str_to_int_rejects(text):
+    with pytest.raises(ValueError):
+        str_to_int(text)
+
+
+@pytest.mark.parametrize('exponent', [1000, 1001, 4000])
+@pytest.mark.parametrize('offset', [-1, 0, 1])
+def test_leading_digits_near_powers_of_ten(exponent, offset):
+    # runs of nines and zeros are where the approximate head could carry wrongly
+    value = power_of_ten(exponent) + offset
+    text = str(value)
+    assert leading_digits(value, 20) == (text[:20], len(text))
+    assert digit_count(value) == len(text)
+
+
+@pytest.mark.parametrize('base, exponent', [(3, 2000), (7, 1500), (-11, 4001)])
+def test_leading_digits(base, exponent):
+    value = base ** exponent
+    text = str(abs(value))
+    assert leading_digits(value, 20) == (text[:20], len(text))
+    assert digit_count(value) == len(text)
+
+
+def test_compact_int():
+    value = 3 ** 2000
+    text = compact_int(-value, 16)
+    head, tail = text.lstrip('-').split('…')
+    assert text[0] == '-' and len(text) == 17
+    assert str(value).startswith(head) and str(value).endswith(tail)
+
+
+def test_formatter_shows_huge_ints_as_head_and_tail():
+    assert '…' in NumberFormatter().format(2 ** 5000)
+    assert NumberFormatter().format(2 ** 53) == str(2 ** 53)
+
+
+@pytest.mark.parametrize('value', [0, 1, -1, 255, -4096, 2 ** 100 + 7, -(3 ** 50)])
+@pytest.mark.parametrize('base', [2, 8, 10, 16])
+def test_radix_round_trip(value, base):
+    assert int(to_base(value, base), base) == value
+
+
+def test_compact_text():
+    assert compact_text('abc', 5) == 'abc'
+    assert compact_text('abcdefgh', 5) == 'ab…gh'
+
+
+def test_radix_views_convert_lazily():
+    views = RadixViews(max_values=2)
+    views.set_value(6.0)
+    assert views.view(2) == '110'
+    assert views.view(2) == '110'
+    assert views.conversions == 1
+    views.set_value(1.5)
+    assert views.view(16) is None
+    for value in (1, 2, 3):
+        views.set_value(value)
+    assert list(views.values) == [2, 3]
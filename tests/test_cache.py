@@ -0,0 +1,56 @@
+from decimal import Decimal
+from fractions import Fraction
+from operator import add, truediv
+
+from calc_cache import ResultCache
+
+
+def test_repeated_calls_hit():
+    cache = ResultCache()
+    calls = []
+
+    def func(left, right):
+        calls.append((left, right))
+        return left + right
+    assert cache.call('+', func, 2, 3) == 5
+    assert cache.call('+', func, 2, 3) == 5
+    assert calls == [(2, 3)]
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+def test_equal_values_of_other_types_are_kept_apart():
+    cache = ResultCache()
+    results = [cache.call('/', truediv, left, 3) for left in (1, 1.0, Decimal(1), Fraction(1))]
+    assert [type(result) for result in results] == [float, float, Decimal, Fraction]
+    assert cache.hits == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.call('+', add, 1, 1)
+    cache.call('+', add, 2, 2)
+    cache.get('+', 1, 1)
+    cache.call('+', add, 3, 3)
+    assert cache.get('+', 2, 2) is None
+    assert cache.get('+', 1, 1) == 2
+    assert cache.evictions == 1
+
+
+def test_byte_budget():
+    cache = ResultCache(max_bytes=1000)
+    cache.store('^', 2, 10_000, 2 ** 10_000)
+    assert not cache.entries
+    for value in range(100):
+        cache.store('+', value, value, 2 * value)
+    assert cache.bytes <= 1000
+    assert cache.bytes == sum(size for _, size in cache.entries.values())
+
+
+def test_store_replaces():
+    cache = ResultCache()
+    cache.store('+', 1, 1, 2)
+    cache.store('+', 1, 1, 2)
+    assert len(cache.entries) == 1
+    assert cache.bytes == next(iter(cache.entries.values()))[1]
+    cache.clear()
+    assert cache.stats()['entries'] == cache.stats()['bytes'] == 0
@@ -0,0 +1,250 @@
+import pytest
+
+from calc_arithmetic import DecimalArithmetic, FractionArithmetic
+from calc_cache import ResultCache
+from calc_engine import (CalculatorEngine, error_zero_div, error_undefined, error_domain, error_syntax,
+                         error_too_large)
+
+
+def press(engine: CalculatorEngine, keys: str) -> CalculatorEngine:
+    # digits and a point are typed, operators are space separated words, '=' calculates
+    for key in keys.split():
+        if key == '=':
+            engine.calculate()
+        elif key in engine.arithmetic.operations:
+            engine.math_operation(key)
+        elif key.lstrip('-').replace('.', '').isdigit():
+            for char in key.lstrip('-'):
+                engine.add_point() if char == '.' else engine.add_digit(char)
+            if key[0] == '-':
+                engine.negate()
+        else:
+            engine.apply_function(key)
+    return engine
+
+
+@pytest.mark.parametrize('keys, entry, temp_text', [
+    ('2 + 3 =', '5', '2 + 3 ='),
+    ('7 - 10 =', '-3', '7 - 10 ='),
+    ('1.5 x 4 =', '6', '1.5 x 4 ='),
+    ('1 / 4 =', '0.25', '1 / 4 ='),
+    ('2 ^ 10 =', '1024', '2 ^ 10 ='),
+    ('8 root 3 =', '2', '8 root 3 ='),
+    ('6 and 3 =', '2', '6 and 3 ='),
+    ('6 xor 3 =', '5', '6 xor 3 ='),
+    ('1 << 4 =', '16', '1 << 4 ='),
+])
+def test_calculation(keys, entry, temp_text):
+    engine = press(CalculatorEngine(), keys)
+    assert engine.entry == entry
+    assert engine.temp_text == temp_text
+
+
+def test_repeated_operator_chains():
+    engine = press(CalculatorEngine(), '2 + 3 +')
+    assert engine.entry == '5'
+    assert engine.temp_text == '5 + '
+
+
+@pytest.mark.parametrize('keys, error', [
+    ('1 / 0 =', error_zero_div),
+    ('0 / 0 =', error_undefined),
+    ('0 ^ -1 =', error_zero_div),
+    ('0 root -2 =', error_zero_div),
+    ('-4 root 2 =', error_domain),
+    ('1.5 and 1 =', error_domain),
+])
+def test_errors(keys, error):
+    engine = press(CalculatorEngine(), keys)
+    assert engine.error == error
+    assert engine.entry == error
+
+
+def test_digit_after_error_starts_a_new_entry():
+    engine = press(CalculatorEngine(), '1 / 0 =')
+    engine.add_digit('7')
+    assert engine.error is None
+    assert engine.entry == '7'
+
+
+def test_entry_length_is_limited():
+    engine = press(CalculatorEngine(), '1' * 20)
+    assert engine.entry == '1' * 16
+    assert engine.entry_number() == int('1' * 16)
+
+
+def test_backspace_keeps_the_value_in_step():
+    engine = press(CalculatorEngine(), '-123')
+    engine.backspace()
+    assert (engine.entry, engine.entry_number()) == ('-12', -12)
+    engine.backspace()
+    engine.backspace()
+    assert (engine.entry, engine.entry_number()) == ('0', 0)
+
+
+def test_digit_after_scientific_result_follows_the_text():
+    engine = press(CalculatorEngine(), '100000000 x 1000000000 =')
+    assert engine.entry == '1e+17'
+    engine.add_digit('3')
+    assert engine.entry_number() == float(engine.entry)
+
+
+def test_backspace_after_scientific_result_follows_the_text():
+    engine = press(CalculatorEngine(), '100000000 x 1000000000 =')
+    engine.backspace()
+    assert engine.entry_number() == float(engine.entry)
+    press(engine, '+ 1 =')
+    assert engine.entry == '11'
+
+
+def test_large_results_are_exact():
+    engine = press(CalculatorEngine(), '2 ^ 64 =')
+    assert engine.result == 2 ** 64
+
+
+def test_percent_of_pending_operand():
+    engine = press(CalculatorEngine(), '200 + 10')
+    engine.percent()
+    assert engine.entry == '20'
+
+
+@pytest.mark.parametrize('arithmetic', [DecimalArithmetic(), FractionArithmetic()])
+def test_functions_combine_with_other_backends(arithmetic):
+    engine = press(CalculatorEngine(arithmetic=arithmetic), '30 sin + 1 =')
+    assert engine.entry == '1.5'
+
+
+def test_decimal_statistics_after_a_function():
+    engine = press(CalculatorEngine(arithmetic=DecimalArithmetic()), '30 sin')
+    engine.add_statistic()
+    press(engine, '1')
+    engine.add_statistic()
+    engine.recall_statistic('mean')
+    assert engine.entry == '0.75'
+
+
+def test_fraction_statistics_stay_exact():
+    engine = CalculatorEngine(arithmetic=FractionArithmetic())
+    for digit in '124':
+        press(engine, digit)
+        engine.add_statistic()
+    values = engine.statistics.values(engine.arithmetic)
+    assert values['mean'] * 3 == 7
+    assert values['variance'] * 3 == 7
+
+
+def test_expression_entry():
+    engine = CalculatorEngine()
+    engine.enter_expression('2 x (3 + 4)')
+    assert engine.entry == '14'
+    engine.enter_expression('2 +')
+    assert engine.error == error_syntax
+
+
+def test_undo_and_redo():
+    engine = press(CalculatorEngine(), '12 + 3 =')
+    engine.undo()
+    assert (engine.entry, engine.operator) == ('3', '+')
+    engine.undo()
+    assert (engine.entry, engine.operator) == ('0', '+')
+    engine.undo()
+    assert (engine.entry, engine.operator) == ('12', None)
+    engine.redo()
+    engine.redo()
+    assert engine.entry == '3'
+
+
+def test_new_action_clears_redo():
+    engine = press(CalculatorEngine(), '12')
+    engine.undo()
+    press(engine, '5')
+    engine.redo()
+    assert engine.entry == '15'
+
+
+
+def test_backspace_clears_compact_entry():
+    engine = press(CalculatorEngine(), '2 ^ 4000 =')
+    assert '…' in engine.entry
+    engine.backspace()
+    assert (engine.entry, engine.entry_number()) == ('0', 0)
+
+
+@pytest.mark.parametrize('edit', ['backspace', 'add_point', 'negate', 'add_digit'])
+def test_compact_entry_edits_keep_a_value(edit):
+    engine = press(CalculatorEngine(), '2 ^ 4000 =')
+    getattr(engine, edit)(*(['5'] if edit == 'add_digit' else []))
+    engine.entry_number()
+    press(engine, '+ 1 =')
+    assert engine.error is None
+    assert '…' in engine.temp_text or engine.temp_text == '0 + 1 ='
+
+
+@pytest.mark.parametrize('keys', ['100000000 x 1000000000 =', '1 / 3 =', '-5 / 3 ='])
+def test_backspace_to_the_start_stays_parseable(keys):
+    engine = press(CalculatorEngine(), keys)
+    while engine.entry != '0':
+        engine.backspace()
+        assert engine.entry_number() == engine.arithmetic.parse(engine.entry)
+
+
+def test_digit_after_infinity_is_refused():
+    engine = CalculatorEngine()
+    engine.set_entry('inf', float('inf'))
+    engine.add_digit('5')
+    assert (engine.entry, engine.entry_number()) == ('inf', float('inf'))
+    engine.backspace()
+    assert (engine.entry, engine.entry_number()) == ('0', 0)
+
+
+def test_huge_expression_power_is_an_error():
+    engine = CalculatorEngine()
+    engine.enter_expression('9^9^9')
+    assert engine.error == error_domain
+
+
+def test_worker_results_are_cached():
+    offloaded = []
+    engine = CalculatorEngine(cache=ResultCache())
+    engine.offload = lambda arithmetic, sign, left, right: offloaded.append((sign, left, right)) or True
+    press(engine, '7 ^ 5 =')
+    assert engine.busy and offloaded == [('^', 7, 5)]
+    engine.finish_calculation(7 ** 5)
+    engine.clear_all()
+    press(engine, '7 ^ 5 =')
+    assert not engine.busy and len(offloaded) == 1
+    assert engine.entry == '16807'
+
+
+def test_worker_out_of_memory_is_an_error():
+    engine = CalculatorEngine()
+    engine.offload = lambda arithmetic, sign, left, right: True
+    press(engine, '7 ^ 5 =')
+    engine.fail_calculation(MemoryError())
+    assert not engine.busy
+    assert engine.error == error_too_large
+
+
+@pytest.mark.parametrize('sign', ['+', '-', 'x'])
+def test_preview_follows_each_edit(sign):
+    cache = ResultCache()
+    engine = press(CalculatorEngine(cache=cache), f'-123456789 {sign}')
+    func = engine.arithmetic.operations[sign]
+    edits = ['7', '0', '5', 'negate', '9', 'backspace', 'backspace', 'negate', 'backspace', 'backspace', '3']
+    for edit in edits:
+        if edit == 'negate':
+            engine.negate()
+        elif edit == 'backspace':
+            engine.backspace()
+        else:
+            engine.add_digit(edit)
+        assert engine.preview() == func(engine.temp, engine.entry_number())
+    # only the first preview ran the operation, the rest stepped from the previous one
+    assert cache.misses == 1
+
+
+def test_preview_of_a_point_entry():
+    engine = press(CalculatorEngine(), '3 x 1.5')
+    assert engine.preview() == 4.5
+    engine.backspace()
+    assert engine.preview() == 3
@@ -0,0 +1,67 @@
+import pytest
+
+from calc_arithmetic import FractionArithmetic
+from calc_expr import ExpressionCompiler, ExpressionError, UndefinedResult, Parser, normalize
+
+
+@pytest.mark.parametrize('source, value', [
+    ('1 + 2 x 3', 7),
+    ('(1 + 2) x 3', 9),
+    ('10 - 4 - 3', 3),
+    ('2 ^ 3 ^ 2', 512),
+    ('-2 ^ 2', -4),
+    ('2 * 3 ÷ 4', 1.5),
+    ('sqrt(16) + sin(30)', 4.5),
+])
+def test_evaluate(source, value):
+    assert ExpressionCompiler().evaluate(source) == value
+
+
+def test_variables():
+    compiled = ExpressionCompiler().compile('a x b + 1')
+    assert compiled.variables == {'a', 'b'}
+    assert compiled(a=2, b=5) == 11
+    with pytest.raises(ExpressionError):
+        compiled(a=2)
+
+
+@pytest.mark.parametrize('source', ['1 +', '(1', '1 2', 'foo(1)', '1..2', ''])
+def test_syntax_errors(source):
+    with pytest.raises(ExpressionError):
+        ExpressionCompiler().evaluate(source)
+
+
+def test_division_errors():
+    compiler = ExpressionCompiler()
+    with pytest.raises(UndefinedResult):
+        compiler.evaluate('0 / 0')
+    with pytest.raises(ZeroDivisionError):
+        compiler.evaluate('1 / (2 - 2)')
+
+
+def test_compiled_expressions_are_cached():
+    compiler = ExpressionCompiler(cache_size=1)
+    compiler.evaluate('1 + 1')
+    compiler.evaluate(' 1+1 ')
+    assert (compiler.hits, compiler.misses) == (1, 1)
+    compiler.evaluate('2 + 2')
+    compiler.evaluate('1 + 1')
+    assert compiler.misses == 3
+
+
+def test_backend_arithmetic():
+    assert ExpressionCompiler(FractionArithmetic()).evaluate('1 / 3 + 1 / 6') * 2 == 1
+
+
+def test_parse_tree():
+    assert Parser(normalize('1 + y')).parse() == ('binary', '+', ('number', '1'), ('name', 'y'))
+
+
+def test_huge_powers_are_refused():
+    compiler = ExpressionCompiler()
+    # folding 9^9^9 would compute 9 ** 387420489
+    compiled = compiler.compile('9^9^9')
+    with pytest.raises(OverflowError):
+        compiled()
+    assert compiler.evaluate('2 ^ 4000') == 2 ** 4000
+    assert ExpressionCompiler(max_cost=None).evaluate('3 ^ 3 ^ 3') == 3 ** 27
@@ -0,0 +1,40 @@
+import pytest
+from PySide6.QtGui import QFont
+
+from calc_fitting import FontFitter
+
+
+@pytest.fixture
+def fitter(app):
+    return FontFitter(QFont(), min_size=4, max_size=40, margin=10, cache_size=8)
+
+
+def test_largest_size_that_fits(fitter):
+    text = '12345678901234567890'
+    for width in (60, 200, 600):
+        size = fitter.fit(text, width)
+        assert fitter.text_width(text, size) <= width - fitter.margin or size == fitter.min_size
+        if size < fitter.max_size:
+            assert fitter.text_width(text, size + 1) > width - fitter.margin
+
+
+def test_sizes_shrink_with_the_text(fitter):
+    sizes = [fitter.fit('9' * digits, 300) for digits in (1, 10, 40)]
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[0] == fitter.max_size
+
+
+def test_results_are_remembered(fitter):
+    size = fitter.fit('3.14159', 120)
+    measured = len(fitter.widths)
+    assert fitter.fit('3.14159', 120) == size
+    assert len(fitter.widths) == measured
+
+
+def test_caches_are_bounded(fitter):
+    for digits in range(1, 30):
+        fitter.fit('1' * digits, 200)
+    assert len(fitter.sizes) <= fitter.cache_size
+    assert len(fitter.widths) <= fitter.cache_size
+    fitter.clear()
+    assert not fitter.sizes and not fitter.widths and not fitter.metrics
@@ -0,0 +1,31 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calc_format import NumberFormatter
+
+
+@pytest.mark.parametrize('value, text', [
+    (3.0, '3'),
+    (-42.0, '-42'),
+    (0.1 + 0.2, '0.30000000000000004'),
+    (1e23, '1e+23'),
+    (1e300, '1e+300'),
+    (2.0 ** 53 - 1, '9007199254740991'),
+    (float('inf'), 'inf'),
+    (Fraction(1, 3), '1/3'),
+    (Decimal('2.50'), '2.5'),
+])
+def test_unbounded(value, text):
+    assert NumberFormatter(None).format(value) == text
+
+
+@pytest.mark.parametrize('value, text', [
+    (1 / 3, '0.33333333333333'),
+    (10 ** 17, '1e+17'),
+    (1e23, '1e+23'),
+    (-123456789012345.0, '-123456789012345'),
+])
+def test_display_length(value, text):
+    assert NumberFormatter(16).format(value) == text
@@ -0,0 +1,82 @@
+import pytest
+
+from calc_arithmetic import operations
+from calc_engine import CalculatorEngine
+from calc_history import History, operator_width
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = History(str(tmp_path / 'history'))
+    yield history
+    history.close()
+
+
+@pytest.mark.parametrize('operator', [*operations, '='])
+def test_every_operator_round_trips(history, operator):
+    # struct pads and truncates s fields silently, a longer operator would be recorded cut short
+    assert len(operator.encode()) <= operator_width
+    history.append('6', operator, '3', '2', 2)
+    assert history[0].operator == operator
+
+
+def test_entries_read_back(history):
+    history.append('1', '+', '2', '3', 3)
+    history.append('2', '^', '100', '1.267650600228e+30', 2 ** 100)
+    assert len(history) == 2
+    entry = history[1]
+    assert (entry.left, entry.operator, entry.right, entry.result) == ('2', '^', '100', '1.267650600228e+30')
+    assert entry.value == float(2 ** 100)
+    with pytest.raises(IndexError):
+        history[2]
+
+
+def test_search_by_result(history):
+    for value in (5, 1, 3, 1, 2 ** 2000):
+        history.append('', '+', '', str(value), value)
+    assert history.search(1) == [1, 3]
+    assert history.search(2, 5) == [0, 2]
+    history.append('', '+', '', '4', 4)
+    assert history.search(4) == [5]
+    assert history.search(10 ** 400) == [4]
+
+
+def test_reopen_appends(tmp_path):
+    path = str(tmp_path / 'history')
+    History(path).append('1', '+', '1', '2', 2)
+    history = History(path)
+    history.append('2', 'x', '2', '4', 4)
+    assert [history[row].result for row in range(len(history))] == ['2', '4']
+
+
+def test_torn_record_is_dropped(tmp_path):
+    path = str(tmp_path / 'history')
+    History(path).append('1', '+', '1', '2', 2)
+    with open(path, 'ab') as file:
+        file.write(b'torn')
+    history = History(path)
+    history.append('2', 'x', '2', '4', 4)
+    assert [history[row].result for row in range(len(history))] == ['2', '4']
+
+
+def test_foreign_file_is_refused(tmp_path):
+    path = tmp_path / 'history'
+    path.write_bytes(b'not a history tape')
+    with pytest.raises(ValueError):
+        History(str(path))
+
+
+def test_engine_records_calculations(history):
+    engine = CalculatorEngine(history=history)
+    for key in ('8', 'root', '3'):
+        engine.math_operation(key) if key == 'root' else engine.add_digit(key)
+    engine.calculate()
+    assert history[0][1:5] == ('8', 'root', '3', '2')
+
+
+def test_short_foreign_file_is_left_alone(tmp_path):
+    path = tmp_path / 'history'
+    path.write_bytes(b'junk\n')
+    with pytest.raises(ValueError):
+        History(str(path))
+    assert path.read_bytes() == b'junk\n'
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from calc_ingest import ingest
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_bytes(text)
+    return str(path)
+
+
+def test_empty_cells_are_skipped(tmp_path):
+    path = write(tmp_path, 'cells.csv', b'1,2\n,3\n4,\n\n6,7\n')
+    first = ingest(path)
+    assert (first.count, first.total, first.minimum, first.maximum) == (3, 11, 1, 6)
+    second = ingest(path, column=1)
+    assert (second.count, second.total) == (3, 12)
+
+
+def test_header_and_comments_are_skipped(tmp_path):
+    path = write(tmp_path, 'header.csv', b'x,y\n1,10\n# note\n3,30\n')
+    statistics = ingest(path, column=1)
+    assert (statistics.count, statistics.average) == (2, 20)
+
+
+def test_empty_first_cell_is_not_a_header(tmp_path):
+    path = write(tmp_path, 'first.csv', b',5\n2,6\n')
+    assert ingest(path, column=1).count == 2
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_chunks_merge_like_one_pass(tmp_path, jobs):
+    values = np.arange(1000, dtype=np.float64) / 7
+    text = ''.join(f'{value},\n' if index % 10 else f',{value}\n' for index, value in enumerate(values.tolist()))
+    statistics = ingest(write(tmp_path, 'chunks.csv', text.encode()), chunk_bytes=1024, jobs=jobs)
+    kept = values[np.arange(len(values)) % 10 != 0]
+    assert statistics.count == len(kept)
+    assert statistics.average == pytest.approx(kept.mean())
+    assert statistics.variance() == pytest.approx(kept.var(ddof=1))
+
+
+def test_binary_columns(tmp_path):
+    values = np.array([[1.0, 2.0], [np.nan, 4.0], [5.0, 6.0]])
+    npy = tmp_path / 'values.npy'
+    np.save(npy, values)
+    assert ingest(str(npy), column=1, chunk_values=2).total == 12
+    raw = write(tmp_path, 'values.f64', values[:, 0].astype('<f8').tobytes())
+    assert ingest(raw).count == 2
+
+
+def test_empty_file(tmp_path):
+    assert ingest(write(tmp_path, 'empty.csv', b'')).count == 0
@@ -0,0 +1,45 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from calc_instance import encode_message, decode_message, hand_over, command_show, ack
+
+posix_only = pytest.mark.skipif(os.name == 'nt', reason='the handoff goes through a named pipe on Windows')
+
+
+def test_messages_round_trip():
+    args = ['--expression', '2 x 3', 'é']
+    assert decode_message(encode_message(args)) == (command_show, args)
+
+
+def test_separators_are_removed_from_arguments():
+    line = encode_message(['one\ntwo', 'three\0four'])
+    assert line.count(b'\n') == 1
+    assert decode_message(line) == (command_show, ['one two', 'threefour'])
+
+
+@posix_only
+def test_nobody_listening(tmp_path):
+    assert not hand_over(['1'], str(tmp_path / 'missing.sock'))
+
+
+@posix_only
+def test_running_instance_acknowledges(tmp_path):
+    path = str(tmp_path / 'calculator.sock')
+    received = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(path)
+        server.listen(1)
+
+        def accept():
+            connection, _ = server.accept()
+            with connection, connection.makefile('rb') as lines:
+                received.append(decode_message(lines.readline()))
+                connection.sendall(ack)
+        thread = threading.Thread(target=accept)
+        thread.start()
+        assert hand_over(['--expression', '1 + 1'], path)
+        thread.join()
+    assert received == [(command_show, ['--expression', '1 + 1'])]
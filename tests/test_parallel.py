@@ -0,0 +1,39 @@
+import pytest
+
+from calc_arithmetic import FloatArithmetic
+from calc_parallel import chunk_bounds, evaluate_file
+from calc_stream import evaluate_lines
+
+
+lines = ['1 + 2\n', '\n', '2 * 3\r\n', '1 / 0\n', 'x\n', '10 ^ 2\n'] * 20 + ['4 - 6']
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'lines.txt'
+    path.write_text(''.join(lines), newline='')
+    return path
+
+
+@pytest.mark.parametrize('chunk_bytes', [1, 16, 1 << 20])
+def test_chunks_end_on_line_breaks(source, chunk_bytes):
+    data = source.read_bytes()
+    bounds = chunk_bounds(str(source), chunk_bytes)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(bounds, bounds[1:]))
+    assert all(data[end - 1:end] == b'\n' for _, end in bounds[:-1])
+
+
+def test_matches_the_serial_stream(source, tmp_path):
+    output = tmp_path / 'results.txt'
+    workers = evaluate_file(str(source), str(output), jobs=2, chunk_bytes=64)
+    assert output.read_text() == ''.join(evaluate_lines(lines, FloatArithmetic()))
+    assert sum(count for count, _ in workers.values()) == len(lines)
+    assert sorted(tmp_path.iterdir()) == sorted([source, output])
+
+
+def test_empty_file(tmp_path):
+    source = tmp_path / 'empty.txt'
+    source.write_bytes(b'')
+    assert evaluate_file(str(source), str(tmp_path / 'results.txt')) == {}
+    assert (tmp_path / 'results.txt').read_bytes() == b''
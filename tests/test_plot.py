@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from calc_expr import ExpressionError
+from calc_plot import PlotExpression, sample_tile, envelopes, tile_span
+
+
+def test_expression_variable():
+    expression = PlotExpression('t^2 + 1')
+    assert expression.variable == 't'
+    assert expression(np.array([0.0, 2.0])).tolist() == [1.0, 5.0]
+    constant = PlotExpression('3')
+    assert constant.variable is None
+    assert constant(np.zeros(4)).tolist() == [3.0] * 4
+
+
+def test_poles_are_nan():
+    ys = PlotExpression('1 / t')(np.array([0.0, 2.0]))
+    assert np.isnan(ys[0]) and ys[1] == 0.5
+
+
+def test_one_variable_only():
+    with pytest.raises(ExpressionError):
+        PlotExpression('a + b')
+
+
+def test_bends_are_refined():
+    line_xs, _ = sample_tile(PlotExpression('t'), 0, -2, 0)
+    xs, ys = sample_tile(PlotExpression('t^2'), 0, -2, 0)
+    assert len(xs) > len(line_xs)
+    assert np.all(np.diff(xs) > 0)
+    assert np.allclose(ys, xs ** 2)
+    # neighbouring tiles share their end samples
+    assert xs[0] == 0 and xs[-1] == tile_span(0)
+
+
+def test_line_is_one_polygon():
+    polygons = envelopes(*sample_tile(PlotExpression('t / 2'), -4, -4, 0), -4, -4, 0)
+    assert len(polygons) == 1
+    assert polygons[0][:, 0].min() == 0 and polygons[0][:, 0].max() == tile_span(-4)
+
+
+def test_poles_split_the_curve():
+    polygons = envelopes(*sample_tile(PlotExpression('1 / (t - 8)'), -4, -4, 0), -4, -4, 0)
+    assert len(polygons) > 1
+    assert not any(polygon[:, 0].min() < 8 < polygon[:, 0].max() for polygon in polygons)
@@ -0,0 +1,51 @@
+import json
+import atexit
+
+import pytest
+
+from calc_profile import LatencyHistogram, SlotProfiler, sub_bucket_bits
+
+
+@pytest.mark.parametrize('value', [0, 1, 15, 16, 17, 1000, 123_456_789, 10 ** 12])
+def test_buckets_stay_within_an_eighth(value):
+    histogram = LatencyHistogram()
+    histogram.record(value)
+    low = histogram.bucket_value(next(iter(histogram.counts)))
+    assert low <= value
+    assert value - low <= value >> sub_bucket_bits
+
+
+def test_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+    assert histogram.percentile(0.5) == pytest.approx(500_000, rel=0.125)
+    assert histogram.percentile(0.99) == pytest.approx(990_000, rel=0.125)
+    summary = histogram.summary()
+    assert summary['count'] == 1000
+    assert summary['max_us'] == 1000
+    assert summary['mean_us'] == pytest.approx(500.5)
+    assert LatencyHistogram().summary() == {'count': 0}
+
+
+class Slots:
+    def __init__(self):
+        self.calls = []
+
+    def press(self, key):
+        self.calls.append(key)
+        return key
+
+
+def test_instrumented_methods_are_timed(tmp_path):
+    path = tmp_path / 'profile.json'
+    profiler = SlotProfiler(str(path))
+    atexit.unregister(profiler.dump)
+    slots = Slots()
+    profiler.instrument(slots, ['press'])
+    assert [slots.press(key) for key in '123'] == ['1', '2', '3']
+    assert slots.calls == ['1', '2', '3']
+    assert slots.press.__name__ == 'press'
+
+    profiler.dump()
+    assert json.loads(path.read_text())['press']['count'] == 3
@@ -0,0 +1,41 @@
+import pytest
+
+from calc_replay import SessionRecorder, read_session, replay, button_names, interactive_slots
+
+
+@pytest.fixture
+def window(app, monkeypatch):
+    from main import Calculator, QFileDialog
+
+    def no_dialog(*args):
+        raise AssertionError('a replay opened a file dialog')
+    monkeypatch.setattr(QFileDialog, 'getOpenFileName', staticmethod(no_dialog))
+    window = Calculator()
+    yield window
+    window.close()
+
+
+def test_dialog_buttons_are_not_recorded(window, tmp_path):
+    assert 'btn_stat_load' not in button_names
+    recorder = SessionRecorder(window)
+    for btn_name in ('btn_2', 'btn_add', 'btn_3', 'btn_equal'):
+        getattr(window.ui, btn_name).click()
+    assert len(recorder) == 4
+
+    path = str(tmp_path / 'session')
+    recorder.save(path)
+    assert list(read_session(path)) == [('add_digit', 'btn_2'), ('math_operation', 'btn_add'),
+                                        ('add_digit', 'btn_3'), ('calculate', 'btn_equal')]
+
+
+def test_dialog_slots_are_skipped(window):
+    events = [('add_digit', 'btn_7'), ('load_statistics', 'btn_stat_load'), ('add_statistic', 'btn_stat_add')]
+    report = replay(window, events)
+    assert not set(report) & set(interactive_slots)
+    assert report['add_statistic']['count'] == 1
+    assert window.engine.statistics.count == 1
+
+
+def test_mismatched_events_are_refused(window):
+    with pytest.raises(ValueError):
+        replay(window, [('calculate', 'btn_7')])
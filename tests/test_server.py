@@ -0,0 +1,35 @@
+import asyncio
+
+from calc_arithmetic import FloatArithmetic, FractionArithmetic
+from calc_engine import error_zero_div, error_undefined, error_domain
+from calc_server import BatchEvaluator, error_too_costly
+
+
+def evaluate(calls, arithmetic=None, **options):
+    evaluator = BatchEvaluator(arithmetic or FloatArithmetic(), **options)
+
+    async def submit_all():
+        return await asyncio.gather(*(evaluator.submit(*call) for call in calls))
+    return evaluator, asyncio.run(submit_all())
+
+
+def test_requests_are_batched():
+    evaluator, results = evaluate([('+', 1, 2), ('x', 2.5, 4), ('/', 1, 0), ('^', 2, 100), ('root', -4, 2)])
+    assert results == [('result', '3'), ('result', '10'), ('error', error_zero_div),
+                       ('result', '1.2676506002e+30'), ('error', error_domain)]
+    assert evaluator.batches == 1
+
+
+def test_only_zero_over_zero_is_undefined():
+    _, results = evaluate([('/', 0, 0), ('^', 0, -1), ('root', 0, -2)])
+    assert results == [('error', error_undefined), ('error', error_zero_div), ('error', error_zero_div)]
+
+
+def test_exact_backend():
+    _, results = evaluate([('/', 1, 3), ('+', 2 ** 60, 1)], FractionArithmetic())
+    assert results == [('result', '0.33333333333333'), ('result', '1.1529215046e+18')]
+
+
+def test_costly_requests_are_refused():
+    _, results = evaluate([('^', 9, 999_999_999), ('^', 2, 10)])
+    assert results == [('error', error_too_costly), ('result', '1024')]
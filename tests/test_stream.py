@@ -0,0 +1,35 @@
+import io
+
+import pytest
+
+from calc_arithmetic import FloatArithmetic, FractionArithmetic
+from calc_engine import error_zero_div, error_undefined, error_domain, error_syntax
+from calc_stream import evaluate_line, evaluate_stream, main
+
+
+@pytest.mark.parametrize('line, output', [
+    ('1 + 2', '3'),
+    ('2 ** 10', '1024'),
+    ('3 * 4', '12'),
+    ('0 / 0', error_undefined),
+    ('0 ^ -1', error_zero_div),
+    ('-4 root 2', error_domain),
+    ('1 +', error_syntax),
+    ('1 ? 2', error_syntax),
+    ('a + 1', error_syntax),
+])
+def test_lines(line, output):
+    assert evaluate_line(line, FloatArithmetic()) == output
+
+
+def test_stream_skips_blank_lines():
+    target = io.StringIO()
+    evaluate_stream(io.StringIO('1 / 3\n\n  \n1 - 1\n'), target, FractionArithmetic())
+    assert target.getvalue() == '1/3\n0\n'
+
+
+def test_files(tmp_path, capsys):
+    path = tmp_path / 'lines.txt'
+    path.write_text('6 x 7\n')
+    assert main([str(path), '--arithmetic', 'decimal']) == 0
+    assert capsys.readouterr().out == '42\n'
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from calc_arithmetic import FloatArithmetic
+from calc_worker import CalculationWorker
+
+
+@pytest.fixture
+def worker(app):
+    worker = CalculationWorker(cost_threshold=0)
+    yield worker
+    worker.shutdown()
+
+
+def wait_for(app, results: list, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not results and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_result_comes_back(app, worker):
+    results = []
+    worker.finished.connect(lambda job_id, value: results.append((job_id, value)))
+    job_id = worker.submit(FloatArithmetic(), '^', 3, 40)
+    wait_for(app, results)
+    assert results == [(job_id, 3 ** 40)]
+    assert worker.is_current(job_id)
+
+
+def test_dead_process_reports_failure(app, worker):
+    failures = []
+    worker.failed.connect(lambda job_id, error: failures.append((job_id, error)))
+    # a worker busy for minutes, killed as the out-of-memory killer would
+    job_id = worker.submit(FloatArithmetic(), '^', 3, 10 ** 9)
+    worker.process.kill()
+    wait_for(app, failures)
+    assert failures and failures[0][0] == job_id
+    assert isinstance(failures[0][1], MemoryError)
+
+    results = []
+    worker.finished.connect(lambda job_id, value: results.append(value))
+    worker.is_current(job_id)
+    worker.submit(FloatArithmetic(), '+', 1, 2)
+    wait_for(app, results)
+    assert results == [3]